@@ -3,7 +3,7 @@
 
 {
     'name': 'Resume Follow-Up Agent',
-    'version': '19.0.1.0.0',
+    'version': '19.0.1.1.0',
     'category': 'Human Resources',
     'summary': 'AI-powered resume follow-up agent for candidate management',
     'description': """
@@ -2,6 +2,7 @@
 
 import json
 import logging
+
 from odoo import http
 from odoo.http import request
 
@@ -13,55 +14,33 @@ class DashboardController(http.Controller):
     @http.route('/resume_followup/dashboard', type='http', auth='user', website=True)
     def dashboard(self, **kwargs):
         """Render the modern dashboard page"""
-        # Get dashboard statistics
-        conversations = request.env['resume.conversation'].search([
-            ('status', '=', 'completed')
-        ])
+        # Get dashboard statistics - aggregated in SQL and cached by resume.dashboard,
+        # so repeated page loads don't rescan the conversations
+        stats_cache = request.env['resume.dashboard']._get_stats_cached()
         
-        # Calculate statistics
-        total_interviews = len(conversations)
-        positive_count = len(conversations.filtered(lambda c: c.sentiment == 'positive'))
-        negative_count = len(conversations.filtered(lambda c: c.sentiment == 'negative'))
-        neutral_count = len(conversations.filtered(lambda c: c.sentiment == 'neutral'))
+        total_interviews = stats_cache['total']
+        positive_count = stats_cache['positive']
+        negative_count = stats_cache['negative']
+        neutral_count = stats_cache['neutral']
         
         positive_percentage = (positive_count / total_interviews * 100) if total_interviews > 0 else 0
         negative_percentage = (negative_count / total_interviews * 100) if total_interviews > 0 else 0
         neutral_percentage = (neutral_count / total_interviews * 100) if total_interviews > 0 else 0
         
-        # Calculate salary statistics
-        def parse_salary(salary_str):
-            if not salary_str:
-                return 0.0
-            try:
-                cleaned = str(salary_str).replace(',', '').replace(' ', '').strip()
-                import re
-                numbers = re.findall(r'\d+', cleaned)
-                if numbers:
-                    return float(numbers[0])
-                return 0.0
-            except (ValueError, TypeError):
-                return 0.0
-        
-        current_salaries = [parse_salary(c.current_salary) for c in conversations if c.current_salary]
-        expected_salaries = [parse_salary(c.expected_salary) for c in conversations if c.expected_salary]
-        
-        current_salaries = [s for s in current_salaries if s > 0]
-        expected_salaries = [s for s in expected_salaries if s > 0]
-        
-        avg_current_salary = sum(current_salaries) / len(current_salaries) if current_salaries else 0
-        min_current_salary = min(current_salaries) if current_salaries else 0
-        max_current_salary = max(current_salaries) if current_salaries else 0
-        
-        avg_expected_salary = sum(expected_salaries) / len(expected_salaries) if expected_salaries else 0
-        min_expected_salary = min(expected_salaries) if expected_salaries else 0
-        max_expected_salary = max(expected_salaries) if expected_salaries else 0
+        avg_current_salary = stats_cache['avg_current']
+        min_current_salary = stats_cache['min_current']
+        max_current_salary = stats_cache['max_current']
+        avg_expected_salary = stats_cache['avg_expected']
+        min_expected_salary = stats_cache['min_expected']
+        max_expected_salary = stats_cache['max_expected']
         
         # Get recent conversations
-        recent_conversations = conversations.sorted('timestamp', reverse=True)[:5]
+        recent_conversations = request.env['resume.conversation'].search(
+            [('status', '=', 'completed')], order='timestamp desc', limit=5,
+        )
         
         # Calculate average call duration
-        durations = [c.duration for c in conversations if c.duration and c.duration > 0]
-        avg_duration_minutes = sum(durations) / len(durations) if durations else 0
+        avg_duration_minutes = stats_cache['avg_duration']
         minutes = int(avg_duration_minutes)
         seconds = int((avg_duration_minutes % 1) * 60)
         avg_duration_display = f"{minutes}:{seconds:02d}"
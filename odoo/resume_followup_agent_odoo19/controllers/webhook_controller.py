@@ -5,6 +5,9 @@ import logging
 from odoo import http
 from odoo.http import request
 
+from ..models.resume_conversation import _map_collected_info, _map_sentiment, _safe_json
+from ..services.omnidimension_ai_service import OmniDimensionAIService
+
 _logger = logging.getLogger(__name__)
 
 
@@ -33,6 +36,9 @@ class WebhookController(http.Controller):
                 _logger.warning("Webhook received but no call_id found")
                 return {'status': 'error', 'message': 'No call_id provided'}
             
+            # The call changed, so a cached status poll is stale
+            OmniDimensionAIService.invalidate_call_status(call_id)
+            
             # Find conversation by call_id
             conversation = request.env['resume.conversation'].sudo().search([
                 ('call_id', '=', str(call_id))
@@ -62,13 +68,7 @@ class WebhookController(http.Controller):
             
             # Update sentiment
             if data.get('sentiment'):
-                sentiment_text = str(data.get('sentiment', '')).lower()
-                if 'positive' in sentiment_text:
-                    update_vals['sentiment'] = 'positive'
-                elif 'negative' in sentiment_text:
-                    update_vals['sentiment'] = 'negative'
-                else:
-                    update_vals['sentiment'] = 'neutral'
+                update_vals['sentiment'] = _map_sentiment(data['sentiment'])
             
             # Update collected data - CRITICAL
             collected_data = (data.get('collected_data') or 
@@ -76,27 +76,14 @@ class WebhookController(http.Controller):
                             data.get('data', {}).get('collected_data') or {})
             
             if collected_data:
-                if isinstance(collected_data, str):
-                    try:
-                        collected_data = json.loads(collected_data)
-                    except:
-                        collected_data = {}
+                # Handle string (possibly double-encoded) JSON, as the call sync does
+                collected_data = _safe_json(collected_data)
                 
                 # Store as JSON
-                update_vals['collected_info'] = json.dumps(collected_data)
+                update_vals['collected_info'] = collected_data
                 
-                # Extract individual fields
-                if collected_data.get('introduction'):
-                    update_vals['introduction'] = collected_data.get('introduction')
-                    update_vals['brief_introduction'] = collected_data.get('introduction')
-                if collected_data.get('current_position'):
-                    update_vals['current_position'] = collected_data.get('current_position')
-                if collected_data.get('current_salary'):
-                    update_vals['current_salary'] = collected_data.get('current_salary')
-                if collected_data.get('expected_salary'):
-                    update_vals['expected_salary'] = collected_data.get('expected_salary')
-                if collected_data.get('notice_period'):
-                    update_vals['notice_period'] = collected_data.get('notice_period')
+                # Extract individual fields with the same mapping as the call sync
+                update_vals.update(_map_collected_info(collected_data))
             
             # Update duration
             if data.get('duration'):
@@ -105,15 +92,14 @@ class WebhookController(http.Controller):
             # Update recording URL
             if data.get('recording_url'):
                 update_vals['call_recording_url'] = data.get('recording_url')
-                update_vals['recording_url'] = data.get('recording_url')
             
             # Update detected language
             if data.get('detected_language'):
                 update_vals['detected_language'] = data.get('detected_language')
             
-            # Write updates
+            # Write updates; the webhook carries the call data, so no API sync is scheduled
             if update_vals:
-                conversation.write(update_vals)
+                conversation.with_context(no_auto_sync=True).write(update_vals)
                 _logger.info(f"✅ Webhook updated conversation {conversation.id} with fields: {list(update_vals.keys())}")
             
             return {'status': 'success', 'message': 'Webhook processed successfully'}
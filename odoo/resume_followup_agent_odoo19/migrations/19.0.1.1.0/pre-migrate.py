@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+
+import logging
+
+_logger = logging.getLogger(__name__)
+
+# Text columns holding JSON that became fields.Json (jsonb) in 19.0.1.1.0
+JSON_COLUMNS = ('conversation_data', 'collected_info')
+
+
+def migrate(cr, version):
+    """Convert the JSON text columns of resume_conversation to jsonb in place
+
+    Without this the ORM would move the old columns aside and create empty
+    jsonb ones. The conversion runs in Postgres, one statement per column;
+    values that are not valid JSON are kept as JSON strings, empty ones
+    become NULL.
+    """
+    if not version:
+        return
+
+    # Session-local helper: a failed cast inside the ALTER would abort it
+    cr.execute("""
+        CREATE OR REPLACE FUNCTION pg_temp.resume_followup_is_json(value text)
+        RETURNS boolean AS $$
+        BEGIN
+            PERFORM value::jsonb;
+            RETURN true;
+        EXCEPTION WHEN others THEN
+            RETURN false;
+        END
+        $$ LANGUAGE plpgsql IMMUTABLE
+    """)
+
+    for column in JSON_COLUMNS:
+        cr.execute("""
+            SELECT data_type
+              FROM information_schema.columns
+             WHERE table_name = 'resume_conversation' AND column_name = %s
+        """, [column])
+        row = cr.fetchone()
+        if not row or row[0] == 'jsonb':
+            continue
+
+        cr.execute(f"""
+            SELECT COUNT(*)
+              FROM resume_conversation
+             WHERE COALESCE("{column}", '') != ''
+               AND NOT pg_temp.resume_followup_is_json("{column}")
+        """)
+        kept_as_text = cr.fetchone()[0]
+
+        cr.execute(f"""
+            ALTER TABLE resume_conversation
+            ALTER COLUMN "{column}" TYPE jsonb USING
+                CASE
+                    WHEN COALESCE("{column}", '') = '' THEN NULL
+                    WHEN pg_temp.resume_followup_is_json("{column}") THEN "{column}"::jsonb
+                    ELSE to_jsonb("{column}")
+                END
+        """)
+        _logger.info(
+            "Converted resume_conversation.%s to jsonb (%s invalid value(s) kept as JSON strings)",
+            column, kept_as_text,
+        )
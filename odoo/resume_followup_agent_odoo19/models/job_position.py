@@ -2,6 +2,7 @@
 
 import logging
 import re
+from collections import Counter
 from odoo import models, fields, api
 from odoo.exceptions import ValidationError
 
@@ -152,18 +153,20 @@ class JobPosition(models.Model):
     def _compute_candidate_stats(self):
         """Compute candidate statistics"""
         for record in self:
+            # Read the statuses once instead of filtering the candidates per status
             candidates = record.candidate_ids
+            status_counts = Counter(candidates.mapped('status'))
             record.candidate_count = len(candidates)
-            record.approved_candidates = len(candidates.filtered(lambda c: c.status == 'hired'))
-            record.rejected_candidates = len(candidates.filtered(lambda c: c.status == 'rejected'))
-            record.pending_candidates = len(candidates.filtered(lambda c: c.status == 'pending'))
+            record.approved_candidates = status_counts['hired']
+            record.rejected_candidates = status_counts['rejected']
+            record.pending_candidates = status_counts['pending']
 
     @api.depends('candidate_ids', 'candidate_ids.status')
     def _compute_positions_filled(self):
         """Compute number of positions filled"""
         for record in self:
             # Count candidates with 'hired' status
-            record.positions_filled = len(record.candidate_ids.filtered(lambda c: c.status == 'hired'))
+            record.positions_filled = record.candidate_ids.mapped('status').count('hired')
 
     @api.depends('positions_to_fill', 'positions_filled')
     def _compute_positions_remaining(self):
@@ -1,6 +1,6 @@
 # -*- coding: utf-8 -*-
 
-from odoo import models, fields, api
+from odoo import models, fields, api, tools
 from ..utils.language_detector import LanguageDetector
 
 
@@ -91,10 +91,36 @@ class ResumeAgentSettings(models.Model):
         help='Define the conversation flow with dynamic questions'
     )
 
+    @api.model_create_multi
+    def create(self, vals_list):
+        records = super().create(vals_list)
+        self.env.registry.clear_cache()  # _get_default_settings_id
+        return records
+
+    def write(self, vals):
+        result = super().write(vals)
+        if 'active' in vals:
+            self.env.registry.clear_cache()  # _get_default_settings_id
+        return result
+
+    def unlink(self):
+        result = super().unlink()
+        self.env.registry.clear_cache()  # _get_default_settings_id
+        return result
+
+    @api.model
+    @tools.ormcache()
+    def _get_default_settings_id(self):
+        """Id of the default agent settings, cached until settings are added, archived or removed
+
+        The lookup is not filtered by company, so neither is the cache.
+        """
+        return self.search([('active', '=', True)], limit=1).id
+
     @api.model
     def get_default_settings(self):
         """Get default agent settings"""
-        settings = self.search([('active', '=', True)], limit=1)
+        settings = self.browse(self._get_default_settings_id())
         if not settings:
             settings = self.create({
                 'agent_name': 'Techvootbot',
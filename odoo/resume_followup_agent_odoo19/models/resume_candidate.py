@@ -10,6 +10,54 @@ from odoo.exceptions import ValidationError
 
 _logger = logging.getLogger(__name__)
 
+# Tier 1 detection patterns are pure ASCII, so they are compiled as bytes
+# patterns and run against the UTF-8 encoded CV to skip Unicode-aware matching.
+_ATS_EMAIL_RE = re.compile(rb'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+_ATS_PHONE_RE = re.compile(
+    rb'(?:\+?\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}|\+?\d{10,15}'
+)
+_ATS_DATE_RE = re.compile(
+    rb'\d{4}|(jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\s+\d{4}'
+)
+# Achievement patterns run on the decoded CV: their context snippets are cut
+# by character, and \d/\s must keep matching non-ASCII digits and spaces.
+_ATS_ACHIEVEMENT_PATTERNS = tuple(
+    (pattern, re.compile(pattern, re.IGNORECASE))
+    for pattern in (
+        r'increased\s+by\s+(\d+%?|\d+\.\d+%)',
+        r'decreased\s+by\s+(\d+%?|\d+\.\d+%)',
+        r'improved\s+by\s+(\d+%?|\d+\.\d+%)',
+        r'(\d+%?)\s+increase',
+        r'(\d+%?)\s+decrease',
+        r'(\d+%?)\s+improvement',
+        r'managed\s+(\d+)\s+',
+        r'led\s+(\d+)\s+',
+        r'team\s+of\s+(\d+)',
+        r'(\d+)\s+years?\s+of\s+experience',
+        r'(\d+)\s+projects?',
+        r'(\d+)\s+customers?',
+        r'(\d+)\s+clients?',
+        r'(\d+)\s+employees?',
+        r'budget\s+of\s+[\$€£]?(\d+[KMB]?)',
+        r'[\$€£](\d+[KMB]?)\s+',
+        r'(\d+)\s+%',
+    )
+)
+
+# Breakdown fields added in a later module version: (field, results tier, key, default)
+_ATS_OPTIONAL_FIELDS = (
+    ('ats_tier1_breakdown', 'tier1', 'breakdown_text', ''),
+    ('ats_tier2_breakdown', 'tier2', 'breakdown_text', ''),
+    ('ats_issues_found', 'tier2', 'issues_text', 'No issues found.'),
+    ('ats_achievements_list', 'tier2', 'achievements_text', 'No achievements found.'),
+)
+
+# _extract_cv_data() keys copied onto empty candidate fields of the same name
+_CV_EXTRACTED_FIELDS = (
+    'email', 'phone', 'education', 'work_experience', 'skills',
+    'certifications', 'languages', 'years_of_experience', 'address',
+)
+
 
 class ResumeCandidate(models.Model):
     _name = 'resume.candidate'
@@ -607,8 +655,8 @@ class ResumeCandidate(models.Model):
         
         _logger.info(f"Successfully extracted {len(cv_text)} characters from CV")
         
-        # Store raw CV text
-        self.cv_text = cv_text
+        # Store raw CV text, plus everything below, in a single write
+        vals = {'cv_text': cv_text}
         
         # Extract structured data
         extracted_data = self._extract_cv_data(cv_text)
@@ -622,31 +670,22 @@ class ResumeCandidate(models.Model):
                 if line and len(line) < 100 and not any(char.isdigit() for char in line[:10]):
                     # Check if it looks like a name (has letters, spaces, maybe some special chars)
                     if any(c.isalpha() for c in line) and len(line.split()) <= 5:
-                        self.name = line
+                        vals['name'] = line
                         break
         
         # Populate fields (only if they're empty to avoid overwriting existing data)
-        if extracted_data.get('email') and not self.email:
-            self.email = extracted_data['email']
-        if extracted_data.get('phone') and not self.phone:
-            self.phone = extracted_data['phone']
-        if extracted_data.get('education') and not self.education:
-            self.education = extracted_data['education']
-        if extracted_data.get('work_experience') and not self.work_experience:
-            self.work_experience = extracted_data['work_experience']
-        if extracted_data.get('skills') and not self.skills:
-            self.skills = extracted_data['skills']
-        if extracted_data.get('certifications') and not self.certifications:
-            self.certifications = extracted_data['certifications']
-        if extracted_data.get('languages') and not self.languages:
-            self.languages = extracted_data['languages']
-        if extracted_data.get('years_of_experience') and not self.years_of_experience:
-            self.years_of_experience = extracted_data['years_of_experience']
-        if extracted_data.get('address') and not self.address:
-            self.address = extracted_data['address']
+        for field_name in _CV_EXTRACTED_FIELDS:
+            if extracted_data.get(field_name) and not self[field_name]:
+                vals[field_name] = extracted_data[field_name]
         
         # Update CV upload date
-        self.cv_upload_date = fields.Datetime.now()
+        vals['cv_upload_date'] = fields.Datetime.now()
+        
+        if isinstance(self.id, int):
+            self.write(vals)
+        else:
+            # New record in an onchange: assign in the cache, nothing to write yet
+            self.update(vals)
 
     def _check_required_libraries(self):
         """Check if required libraries are installed"""
@@ -852,7 +891,7 @@ class ResumeCandidate(models.Model):
 
     # ========== ATS Resume Checker Methods ==========
     
-    def _analyze_ats_tier1(self, cv_text):
+    def _analyze_ats_tier1(self, cv_text, cv_bytes=None):
         """
         Tier 1 Analysis: Proportion of content that can be interpreted by ATS
         Similar to an ATS, we analyze and attempt to comprehend the resume.
@@ -876,6 +915,8 @@ class ResumeCandidate(models.Model):
         }
         
         cv_lower = cv_text.lower()
+        if cv_bytes is None:
+            cv_bytes = cv_text.encode('utf-8', errors='replace')
         parsed_sections = []
         missing_sections = []
         keywords_found = []
@@ -898,26 +939,19 @@ class ResumeCandidate(models.Model):
             structured_data_score += 1
         
         # Email detection
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        if re.search(email_pattern, cv_text):
+        if _ATS_EMAIL_RE.search(cv_bytes):
             structured_data['email'] = True
             structured_data_score += 1
         
-        # Phone detection
-        phone_patterns = [
-            r'(\+?\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}',
-            r'\+?\d{10,15}',
-        ]
-        if any(re.search(pattern, cv_text) for pattern in phone_patterns):
+        # Date detection (for experience/education dates)
+        dates_found = len(_ATS_DATE_RE.findall(cv_bytes.lower()))
+        
+        # Phone detection - every phone pattern ends in a 4-digit run, which the
+        # date pattern also matches, so CVs without dates cannot contain a phone
+        if dates_found and _ATS_PHONE_RE.search(cv_bytes):
             structured_data['phone'] = True
             structured_data_score += 1
         
-        # Date detection (for experience/education dates)
-        date_patterns = [
-            r'\d{4}',  # Years
-            r'(jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\s+\d{4}',
-        ]
-        dates_found = len(re.findall('|'.join(date_patterns), cv_lower))
         structured_data['dates'] = dates_found
         
         # Calculate interpretable content percentage
@@ -1076,57 +1110,29 @@ class ResumeCandidate(models.Model):
                 'metrics_found': []
             }
         
-        # Patterns for quantifiable achievements
-        achievement_patterns = [
-            r'increased\s+by\s+(\d+%?|\d+\.\d+%)',
-            r'decreased\s+by\s+(\d+%?|\d+\.\d+%)',
-            r'improved\s+by\s+(\d+%?|\d+\.\d+%)',
-            r'(\d+%?)\s+increase',
-            r'(\d+%?)\s+decrease',
-            r'(\d+%?)\s+improvement',
-            r'managed\s+(\d+)\s+',
-            r'led\s+(\d+)\s+',
-            r'team\s+of\s+(\d+)',
-            r'(\d+)\s+years?\s+of\s+experience',
-            r'(\d+)\s+projects?',
-            r'(\d+)\s+customers?',
-            r'(\d+)\s+clients?',
-            r'(\d+)\s+employees?',
-            r'budget\s+of\s+[\$€£]?(\d+[KMB]?)',
-            r'[\$€£](\d+[KMB]?)\s+',
-            r'(\d+)\s+%',
-        ]
-        
-        achievements = []
-        metrics_found = []
+        # Keyed on value so duplicates are dropped during collection (dicts keep insertion order)
+        unique_achievements = {}
         
-        for pattern in achievement_patterns:
-            matches = re.finditer(pattern, cv_text, re.IGNORECASE)
+        for pattern, compiled in _ATS_ACHIEVEMENT_PATTERNS:
+            matches = compiled.finditer(cv_text)
             for match in matches:
                 value = match.group(1) if match.groups() else match.group(0)
+                if value in unique_achievements:
+                    continue
                 context_start = max(0, match.start() - 50)
                 context_end = min(len(cv_text), match.end() + 50)
                 context = cv_text[context_start:context_end].strip()
                 
-                achievements.append({
+                unique_achievements[value] = {
                     'value': value,
                     'context': context,
                     'pattern': pattern
-                })
-                metrics_found.append(value)
-        
-        # Remove duplicates based on value
-        unique_achievements = []
-        seen_values = set()
-        for ach in achievements:
-            if ach['value'] not in seen_values:
-                unique_achievements.append(ach)
-                seen_values.add(ach['value'])
+                }
         
         return {
             'count': len(unique_achievements),
-            'achievements': unique_achievements[:20],  # Limit to 20
-            'metrics_found': list(set(metrics_found))[:30]
+            'achievements': list(unique_achievements.values())[:20],  # Limit to 20
+            'metrics_found': list(unique_achievements)[:30]
         }
     
     def _analyze_ats_tier2(self, cv_text):
@@ -1242,6 +1248,15 @@ class ResumeCandidate(models.Model):
             }
         }
     
+    @classmethod
+    def _get_ats_optional_fields(cls):
+        """Return the optional ATS breakdown fields known to this model (cached per class)"""
+        optional_fields = cls.__dict__.get('_ats_optional_fields')
+        if optional_fields is None:
+            optional_fields = tuple(spec for spec in _ATS_OPTIONAL_FIELDS if spec[0] in cls._fields)
+            cls._ats_optional_fields = optional_fields
+        return optional_fields
+    
     def action_run_ats_analysis(self):
         """Run complete ATS analysis on the CV"""
         self.ensure_one()
@@ -1255,8 +1270,14 @@ class ResumeCandidate(models.Model):
         _logger.info(f"Starting ATS analysis for candidate {self.id}")
         
         try:
+            # Single timestamp shared by the JSON details and ats_analysis_date
+            now = fields.Datetime.now()
+            
+            # Encode once; the ASCII-only tier 1 patterns match on bytes
+            cv_bytes = self.cv_text.encode('utf-8', errors='replace')
+            
             # Tier 1 Analysis: Content Interpretation
-            tier1_results = self._analyze_ats_tier1(self.cv_text)
+            tier1_results = self._analyze_ats_tier1(self.cv_text, cv_bytes)
             
             # Tier 2 Analysis: Content Quality
             tier2_results = self._analyze_ats_tier2(self.cv_text)
@@ -1295,7 +1316,7 @@ class ResumeCandidate(models.Model):
             analysis_details = {
                 'tier1': tier1_results,
                 'tier2': tier2_results,
-                'analysis_date': fields.Datetime.now().isoformat(),
+                'analysis_date': now.isoformat(),
             }
             
             # Update fields - use safe write to handle missing columns
@@ -1306,7 +1327,7 @@ class ResumeCandidate(models.Model):
                 'ats_spelling_errors': tier2_results['spelling_errors'],
                 'ats_grammar_errors': tier2_results['grammar_issues'],
                 'ats_quantifiable_achievements': tier2_results['achievements_count'],
-                'ats_analysis_date': fields.Datetime.now(),
+                'ats_analysis_date': now,
                 'ats_analysis_details': json.dumps(analysis_details, indent=2),
                 'ats_keywords_found': ', '.join(tier1_results['keywords_found'][:30]),
                 'ats_missing_sections': ', '.join(tier1_results['missing_sections']),
@@ -1314,29 +1335,11 @@ class ResumeCandidate(models.Model):
             }
             
             # Add new fields only if they exist in the model (after module upgrade)
-            model_fields = self._fields.keys()
-            if 'ats_tier1_breakdown' in model_fields:
-                update_vals['ats_tier1_breakdown'] = tier1_results.get('breakdown_text', '')
-            if 'ats_tier2_breakdown' in model_fields:
-                update_vals['ats_tier2_breakdown'] = tier2_results.get('breakdown_text', '')
-            if 'ats_issues_found' in model_fields:
-                update_vals['ats_issues_found'] = tier2_results.get('issues_text', 'No issues found.')
-            if 'ats_achievements_list' in model_fields:
-                update_vals['ats_achievements_list'] = tier2_results.get('achievements_text', 'No achievements found.')
+            results = {'tier1': tier1_results, 'tier2': tier2_results}
+            for field_name, tier, key, default in self._get_ats_optional_fields():
+                update_vals[field_name] = results[tier].get(key, default)
             
-            # Write with error handling in case columns don't exist in DB yet
-            try:
-                self.write(update_vals)
-            except Exception as e:
-                # If new fields cause error, write without them
-                if 'ats_tier1_breakdown' in str(e) or 'ats_tier2_breakdown' in str(e) or 'ats_issues_found' in str(e) or 'ats_achievements_list' in str(e):
-                    _logger.warning("New ATS fields not available in database yet. Please upgrade the module.")
-                    # Remove new fields and write again
-                    safe_vals = {k: v for k, v in update_vals.items() 
-                                if k not in ['ats_tier1_breakdown', 'ats_tier2_breakdown', 'ats_issues_found', 'ats_achievements_list']}
-                    self.write(safe_vals)
-                else:
-                    raise
+            self.write(update_vals)
             
             _logger.info(
                 f"ATS analysis completed: Tier1={tier1_results['score']:.1f}, "
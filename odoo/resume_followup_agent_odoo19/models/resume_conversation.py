@@ -1,13 +1,98 @@
 # -*- coding: utf-8 -*-
 
+import functools
 import json
 import logging
-from odoo import models, fields, api
+from odoo import models, fields, api, tools
 from odoo.exceptions import ValidationError, UserError
 from datetime import datetime, timedelta
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 _logger = logging.getLogger(__name__)
 
+# orjson when installed, stdlib json otherwise; both raise ValueError subclasses
+if orjson:
+    json_loads = orjson.loads
+
+    def _json_key(value):
+        """Canonical (sorted) serialization used to group identical values"""
+        return orjson.dumps(value, option=orjson.OPT_SORT_KEYS, default=str)
+else:
+    json_loads = json.loads
+
+    def _json_key(value):
+        """Canonical (sorted) serialization used to group identical values"""
+        return json.dumps(value, sort_keys=True, default=str)
+
+# Concurrent OmniDimension requests issued by action_sync_call_data_batch
+SYNC_MAX_WORKERS = 8
+
+# collected_info keys copied as-is onto the conversation by the call sync
+_SYNC_COLLECTED_FIELDS = ('current_position', 'current_salary', 'expected_salary', 'notice_period')
+# Conversation fields mirrored on the candidate after a sync
+_CANDIDATE_SYNC_FIELDS = ('introduction',) + _SYNC_COLLECTED_FIELDS
+# Canonical sentiment labels returned by the API, resolved with a single lookup
+_SENTIMENT_LABELS = {'positive': 'positive', 'negative': 'negative', 'neutral': 'neutral'}
+# Json fields that older callers still fill with JSON-encoded strings
+_JSON_FIELDS = ('conversation_data', 'collected_info')
+
+
+def _map_collected_info(collected):
+    """Map a collected_info dict to conversation field values, skipping empty ones"""
+    mapped = {}
+    if intro := collected.get('introduction') or collected.get('brief_introduction'):
+        mapped['introduction'] = mapped['brief_introduction'] = intro
+    for field_name in _SYNC_COLLECTED_FIELDS:
+        if value := collected.get(field_name):
+            mapped[field_name] = value
+    return mapped
+
+
+def _map_sentiment(label):
+    """Map a sentiment label from the API to a conversation sentiment"""
+    label = str(label).strip().lower()
+    sentiment = _SENTIMENT_LABELS.get(label)
+    if sentiment:
+        return sentiment
+    # Free-form labels such as "Very Positive"
+    if 'positive' in label:
+        return 'positive'
+    if 'negative' in label:
+        return 'negative'
+    return 'neutral'
+
+
+def _normalize_json_vals(vals):
+    """Decode legacy JSON strings given for the Json fields, in place"""
+    for field_name in _JSON_FIELDS:
+        value = vals.get(field_name)
+        if isinstance(value, str):
+            try:
+                vals[field_name] = json_loads(value) if value else False
+            except ValueError:
+                vals[field_name] = False
+    return vals
+
+
+def _safe_json(value):
+    """Decode an API payload that may be a dict, a JSON string or a double-encoded JSON string
+
+    Each layer is parsed exactly once; anything that does not decode to a
+    dict yields an empty dict.
+    """
+    try:
+        if isinstance(value, str):
+            value = json_loads(value)
+        if isinstance(value, str):
+            value = json_loads(value)
+    except (ValueError, TypeError):
+        return {}
+    return value if isinstance(value, dict) else {}
+
 
 class ResumeConversation(models.Model):
     _name = 'resume.conversation'
@@ -20,7 +105,7 @@ class ResumeConversation(models.Model):
         string='Candidate',
         required=True,
         ondelete='cascade',
-        tracking=True
+        index=True
     )
     candidate_name = fields.Char(
         related='candidate_id.name',
@@ -41,17 +126,18 @@ class ResumeConversation(models.Model):
     job_title = fields.Char(string='Job Title', required=True)
     
     # Conversation data
-    conversation_data = fields.Text(
+    conversation_data = fields.Json(
         string='Conversation Data',
-        help='JSON formatted conversation messages'
+        prefetch=False,
+        help='Conversation messages (list)'
     )
-    transcript = fields.Text(string='Call Transcript', help='Full phone call transcript and notes')
+    transcript = fields.Text(string='Call Transcript', prefetch=False, help='Full phone call transcript and notes')
     duration = fields.Float(string='Duration (minutes)', default=0.0)
     
     # Collected information
-    collected_info = fields.Text(
+    collected_info = fields.Json(
         string='Collected Information',
-        help='JSON formatted collected information'
+        help='Collected information (dict)'
     )
     brief_introduction = fields.Text(
         string='Brief Introduction',
@@ -77,6 +163,7 @@ class ResumeConversation(models.Model):
     # AI Analysis and Statistics
     ai_analysis = fields.Text(
         string='AI Analysis',
+        prefetch=False,
         help='AI-generated analysis of the call communication'
     )
     communication_score = fields.Float(
@@ -120,6 +207,7 @@ class ResumeConversation(models.Model):
     # Statistics JSON
     call_statistics = fields.Text(
         string='Call Statistics (JSON)',
+        prefetch=False,
         help='Detailed statistics in JSON format'
     )
     
@@ -141,14 +229,20 @@ class ResumeConversation(models.Model):
     # Call identification and details (matching Google Sheet structure)
     call_id = fields.Char(
         string='Call ID',
+        index=True,
+        copy=False,
         help='OmniDimension call identifier'
     )
     call_request_id = fields.Char(
         string='Call Request ID',
+        index=True,
+        copy=False,
         help='ID of the request that initiated this call'
     )
     call_sid = fields.Char(
         string='Call SID',
+        index=True,
+        copy=False,
         help='Telephony provider call identifier (legacy)'
     )
     
@@ -185,12 +279,13 @@ class ResumeConversation(models.Model):
     # Call recording
     call_recording_url = fields.Char(
         string='Call Recording URL',
+        copy=False,
         help='URL to the recorded call audio'
     )
     recording_url = fields.Char(
         string='Recording URL',
         related='call_recording_url',
-        store=True,
+        store=False,
         help='URL to the call recording (alias for call_recording_url)'
     )
     
@@ -227,25 +322,19 @@ class ResumeConversation(models.Model):
     )
     full_conversation = fields.Text(
         string='Full Conversation',
+        prefetch=False,
         help='Complete conversation transcript'
     )
-    call_duration_in_minutes = fields.Float(
-        string='Call Duration (Minutes)',
-        help='Call duration in minutes',
-        compute='_compute_call_duration_minutes',
-        store=True
-    )
     call_duration_in_seconds = fields.Integer(
         string='Call Duration (Seconds)',
         help='Call duration in seconds',
-        compute='_compute_call_duration_seconds',
-        store=True
+        compute='_compute_call_duration_seconds'
     )
     applicant_name = fields.Char(
         string='Applicant Name',
         help='Name of the applicant/candidate',
         related='candidate_name',
-        store=True
+        store=False
     )
     
     # Timestamps
@@ -254,12 +343,13 @@ class ResumeConversation(models.Model):
         default=fields.Datetime.now,
         required=True,
         readonly=True,
+        index=True,
         help='Date and time when the phone call was made'
     )
     call_date = fields.Datetime(
         string='Call Date',
         related='timestamp',
-        store=True,
+        store=False,
         readonly=True,
         help='Date and time when the phone call was made (alias for timestamp)'
     )
@@ -278,7 +368,7 @@ class ResumeConversation(models.Model):
     message_count = fields.Integer(
         string='Message Count',
         compute='_compute_message_count',
-        store=False
+        store=True
     )
     
     # Status
@@ -286,7 +376,7 @@ class ResumeConversation(models.Model):
         ('in_progress', 'In Progress'),
         ('completed', 'Completed'),
         ('cancelled', 'Cancelled')
-    ], string='Status', default='completed', required=True)
+    ], string='Status', default='completed', required=True, tracking=True)
     
     # Company
     company_id = fields.Many2one(
@@ -295,15 +385,25 @@ class ResumeConversation(models.Model):
         default=lambda self: self.env.company
     )
 
-    @api.depends('duration')
-    def _compute_call_duration_minutes(self):
-        """Compute call duration in minutes"""
-        for record in self:
-            record.call_duration_in_minutes = record.duration or 0.0
-    
+    def init(self):
+        # Serves the status-filtered lists and dashboards in their default 'timestamp desc' order
+        tools.create_index(
+            self.env.cr, 'resume_conversation_status_ts_idx', self._table, ['status', 'timestamp DESC']
+        )
+        # Multi-company lists filtered by status, top page read straight from the index
+        tools.create_index(
+            self.env.cr, 'resume_conversation_company_status_ts_idx', self._table,
+            ['company_id', 'status', 'timestamp DESC']
+        )
+        # Dashboard sentiment GROUP BY only ever looks at completed conversations
+        tools.create_index(
+            self.env.cr, 'resume_conversation_completed_sentiment_idx', self._table, ['sentiment'],
+            where="status = 'completed'"
+        )
+
     @api.depends('duration')
     def _compute_call_duration_seconds(self):
-        """Compute call duration in seconds"""
+        """Compute call duration in seconds (not stored, derived from duration on read)"""
         for record in self:
             record.call_duration_in_seconds = int((record.duration or 0.0) * 60)
     
@@ -311,107 +411,114 @@ class ResumeConversation(models.Model):
     def _compute_date_time(self):
         """Compute date and time from timestamp"""
         for record in self:
-            if record.timestamp:
-                record.date = record.timestamp.date()
-                record.time = record.timestamp.strftime('%H:%M:%S')
-            else:
-                record.date = False
-                record.time = False
+            timestamp = record.timestamp
+            record.date = timestamp and timestamp.date()
+            record.time = timestamp and timestamp.strftime('%H:%M:%S')
 
     @api.depends('conversation_data')
     def _compute_message_count(self):
-        """Compute message count from conversation data"""
+        """Compute message count from conversation data
+
+        Saved records are counted in Postgres with jsonb_array_length so the
+        messages are never loaded into Python; new records (onchange) use the
+        cached value.
+        """
+        counts = {}
+        saved = self.filtered(lambda r: isinstance(r.id, int))
+        if saved:
+            saved.flush_recordset(['conversation_data'])
+            self.env.cr.execute("""
+                SELECT id,
+                       CASE WHEN jsonb_typeof(conversation_data) = 'array'
+                            THEN jsonb_array_length(conversation_data)
+                            ELSE 0
+                       END
+                  FROM resume_conversation
+                 WHERE id = ANY(%s)
+            """, [saved.ids])
+            counts = dict(self.env.cr.fetchall())
+        
         for record in self:
-            try:
-                if record.conversation_data:
-                    data = json.loads(record.conversation_data)
-                    record.message_count = len(data) if isinstance(data, list) else 0
-                else:
-                    record.message_count = 0
-            except (json.JSONDecodeError, TypeError):
-                record.message_count = 0
+            if record in saved:
+                record.message_count = counts.get(record.id, 0)
+            else:
+                data = record.conversation_data
+                record.message_count = len(data) if isinstance(data, list) else 0
+
+    def _create_with_sync(self, vals_list):
+        """Create conversations and sync call data if call_id exists
 
-    def _create_with_sync(self, vals):
-        """Create conversation and sync call data if call_id exists"""
-        # Update candidate's last_contacted
-        if 'candidate_id' in vals:
-            candidate = self.env['resume.candidate'].browse(vals['candidate_id'])
-            candidate.write({
-                'last_contacted': fields.Datetime.now(),
+        Candidate updates are merged per candidate and written once per
+        distinct set of values before the conversations are inserted in a
+        single batch.
+
+        Pass ``no_auto_sync=True`` in the context (imports, data migrations,
+        test fixtures) to skip the OmniDimension sync, like ``tracking_disable``
+        skips mail tracking.
+        """
+        now = fields.Datetime.now()
+        candidate_writes = {}
+        for vals in vals_list:
+            # Candidate's last_contacted/status, plus collected info, in a single write
+            candidate_vals = {
+                'last_contacted': now,
                 'status': 'contacted'
-            })
-        
-        # Parse collected_info and update candidate fields
-        if 'collected_info' in vals and vals.get('collected_info'):
-            try:
-                collected = json.loads(vals['collected_info'])
-                if 'candidate_id' in vals:
-                    candidate = self.env['resume.candidate'].browse(vals['candidate_id'])
-                    candidate.write({
-                        'introduction': collected.get('introduction', ''),
-                        'current_position': collected.get('current_position', ''),
-                        'current_salary': collected.get('current_salary', ''),
-                        'expected_salary': collected.get('expected_salary', ''),
-                        'notice_period': collected.get('notice_period', ''),
-                    })
-            except (json.JSONDecodeError, TypeError):
-                pass
+            }
+            
+            # collected_info feeds both the candidate and the conversation fields
+            _normalize_json_vals(vals)
+            collected = vals.get('collected_info')
+            if isinstance(collected, dict):
+                mapped = _map_collected_info(collected)
+                candidate_vals.update(
+                    (field_name, mapped[field_name]) for field_name in _CANDIDATE_SYNC_FIELDS if field_name in mapped
+                )
+                
+                # Propagate to conversation fields not given explicitly
+                for field_name, value in mapped.items():
+                    vals.setdefault(field_name, value)
+            
+            if vals.get('candidate_id'):
+                candidate_writes.setdefault(vals['candidate_id'], {}).update(candidate_vals)
         
-        # Parse collected_info to conversation fields
-        if 'collected_info' in vals and vals.get('collected_info'):
-            try:
-                collected = json.loads(vals['collected_info'])
-                if 'introduction' not in vals:
-                    vals['introduction'] = collected.get('introduction', '')
-                if 'brief_introduction' not in vals:
-                    vals['brief_introduction'] = collected.get('introduction', '')
-                if 'current_position' not in vals:
-                    vals['current_position'] = collected.get('current_position', '')
-                if 'current_salary' not in vals:
-                    vals['current_salary'] = collected.get('current_salary', '')
-                if 'expected_salary' not in vals:
-                    vals['expected_salary'] = collected.get('expected_salary', '')
-                if 'notice_period' not in vals:
-                    vals['notice_period'] = collected.get('notice_period', '')
-            except (json.JSONDecodeError, TypeError):
-                pass
+        # Group candidates receiving identical values so each group is one write
+        groups = {}
+        for candidate_id, candidate_vals in candidate_writes.items():
+            key = _json_key(candidate_vals)
+            groups.setdefault(key, (candidate_vals, []))[1].append(candidate_id)
+        for candidate_vals, candidate_ids in groups.values():
+            self.env['resume.candidate'].browse(candidate_ids).write(candidate_vals)
         
-        record = super(ResumeConversation, self).create(vals)
+        records = super(ResumeConversation, self).create(vals_list)
         
         # Auto-sync call data if call_id exists and status is in_progress
-        if record.call_id and record.status == 'in_progress':
-            # Try to sync immediately, but don't fail if it doesn't work
-            try:
-                record.action_sync_call_data()
-            except Exception as e:
-                _logger.warning(f"Auto-sync failed for call_id {record.call_id}: {e}")
+        if not self.env.context.get('no_auto_sync'):
+            to_sync = records.filtered(lambda r: r.call_id and r.status == 'in_progress')
+            if to_sync:
+                # Try to sync immediately, but don't fail if it doesn't work
+                try:
+                    to_sync.action_sync_call_data_batch()
+                except Exception as e:
+                    _logger.warning("Auto-sync failed for call_ids %s: %s", to_sync.mapped('call_id'), e)
         
-        return record
+        return records
     
-    @api.model
-    def create(self, vals):
-        """Override create to update candidate and parse collected info"""
-        return self._create_with_sync(vals)
+    @api.model_create_multi
+    def create(self, vals_list):
+        """Override create to update candidates and parse collected info"""
+        return self._create_with_sync(vals_list)
 
     def get_conversation_messages(self):
         """Get conversation messages as list"""
         self.ensure_one()
-        try:
-            if self.conversation_data:
-                return json.loads(self.conversation_data)
-            return []
-        except (json.JSONDecodeError, TypeError):
-            return []
+        data = self.conversation_data
+        return data if isinstance(data, list) else []
 
     def get_collected_info_dict(self):
         """Get collected information as dictionary"""
         self.ensure_one()
-        try:
-            if self.collected_info:
-                return json.loads(self.collected_info)
-            return {}
-        except (json.JSONDecodeError, TypeError):
-            return {}
+        info = self.collected_info
+        return info if isinstance(info, dict) else {}
 
     def action_view_transcript(self):
         """Action to view full transcript"""
@@ -429,19 +536,165 @@ class ResumeConversation(models.Model):
     
     def write(self, vals):
         """Override write to auto-sync when status changes to completed"""
-        result = super(ResumeConversation, self).write(vals)
+        result = super(ResumeConversation, self).write(_normalize_json_vals(vals))
         
-        # Auto-sync when status changes to completed
-        if 'status' in vals and vals['status'] == 'completed':
-            for record in self:
-                if record.call_id:
-                    try:
-                        record.action_sync_call_data()
-                    except:
-                        pass  # Don't fail write if sync fails
+        # Auto-sync when status changes to completed (skipped for the sync's own writes).
+        # Deferred until after commit so this write is flushed and never fails because of the API.
+        if vals.get('status') == 'completed' and not self.env.context.get('no_auto_sync'):
+            ids_to_sync = self.filtered('call_id').ids
+            if ids_to_sync:
+                self.env.cr.postcommit.add(functools.partial(self._post_commit_sync, ids_to_sync))
         
         return result
     
+    def _post_commit_sync(self, ids):
+        """Batch-sync the given conversations in a new transaction (post-commit hook)"""
+        with self.env.registry.cursor() as cr:
+            env = self.env(cr=cr)
+            try:
+                env['resume.conversation'].browse(ids).exists().action_sync_call_data_batch()
+            except Exception as e:
+                cr.rollback()
+                _logger.warning(f"Post-commit sync failed for conversations {ids}: {e}")
+    
+    def _get_call_data_service(self):
+        """Build the OmniDimension service from the default telephony configuration"""
+        telephony_config = self.env['resume.telephony.config'].get_default_config()
+        if not telephony_config or telephony_config.provider_name != 'omnidimension_ai':
+            raise UserError('OmniDimension AI telephony configuration not found.')
+        
+        from ..services.omnidimension_ai_service import OmniDimensionAIService
+        
+        config = {
+            'api_key': telephony_config.account_sid or '',
+            'api_endpoint': telephony_config.api_endpoint,
+            'agent_id': telephony_config.agent_id or '',
+            'voice_id': telephony_config.voice_id or '',
+        }
+        
+        return OmniDimensionAIService(config)
+    
+    @api.model
+    def _prepare_call_sync_vals(self, call_status):
+        """Map a get_call_status() response to conversation values"""
+        update_vals = {}
+        
+        # Update recording URL if available
+        if call_status.get('recording_url'):
+            update_vals['call_recording_url'] = call_status.get('recording_url')
+        
+        # Update transcript if available
+        if call_status.get('transcript'):
+            update_vals['transcript'] = call_status.get('transcript')
+        
+        # Update summary if available
+        if call_status.get('summary'):
+            update_vals['summary'] = call_status.get('summary', '')
+        
+        # Update sentiment if available (can be text or score)
+        if call_status.get('sentiment'):
+            update_vals['sentiment'] = _map_sentiment(call_status['sentiment'])
+        elif call_status.get('sentiment_score') is not None:
+            # Convert sentiment score to text
+            sentiment_score = call_status.get('sentiment_score', 0)
+            if sentiment_score > 0.3:
+                update_vals['sentiment'] = 'positive'
+            elif sentiment_score < -0.3:
+                update_vals['sentiment'] = 'negative'
+            else:
+                update_vals['sentiment'] = 'neutral'
+        
+        # Update collected data if available - ENHANCED to capture all fields
+        collected_data = call_status.get('collected_data', {})
+        if not collected_data:
+            # Try alternative keys
+            collected_data = call_status.get('collected_info', {}) or call_status.get('data', {}) or call_status.get('metadata', {})
+        
+        if collected_data:
+            # Handle string (possibly double-encoded) JSON
+            collected_data = _safe_json(collected_data)
+            
+            # Store as JSON
+            update_vals['collected_info'] = collected_data
+            
+            # Extract specific fields - ensure ALL fields are populated
+            update_vals.update(_map_collected_info(collected_data))
+            
+            # Update detected language if available
+            if 'detected_language' in collected_data:
+                update_vals['detected_language'] = collected_data.get('detected_language')
+        
+        # Update duration if available
+        if call_status.get('duration'):
+            update_vals['duration'] = call_status.get('duration', 0) / 60.0  # Convert to minutes
+        
+        # Update status
+        call_status_value = call_status.get('status', 'completed')
+        if call_status_value == 'completed':
+            update_vals['status'] = 'completed'
+        elif call_status_value in ['in_progress', 'ringing', 'answered']:
+            update_vals['status'] = 'in_progress'
+        
+        return update_vals
+    
+    def _apply_call_sync_vals(self, update_vals):
+        """Write synced values on the conversations and propagate them to their candidates"""
+        # The sync's own status write must not trigger another sync, nor post tracking messages
+        self.with_context(no_auto_sync=True, tracking_disable=True, mail_notrack=True).write(update_vals)
+        
+        # Update candidate fields with synced data
+        candidates = self.candidate_id
+        if candidates:
+            candidate_updates = {
+                field_name: update_vals[field_name]
+                for field_name in _CANDIDATE_SYNC_FIELDS
+                if field_name in update_vals
+            }
+            if candidate_updates:
+                candidates.write(candidate_updates)
+                _logger.info(f"✅ Updated candidate(s) {candidates.ids} with synced data")
+    
+    def action_sync_call_data_batch(self):
+        """Sync call data for several conversations at once
+
+        The OmniDimension requests are fanned out over a thread pool (threads
+        only do HTTP, never ORM work), then the results are written back in
+        the current transaction. Returns the conversations that were updated.
+        """
+        # Only read what the sync needs: without this, touching call_id would
+        # prefetch transcripts and other large text columns for the whole batch
+        records = self.with_context(prefetch_fields=False)
+        rows = [row for row in records.read(['call_id']) if row['call_id']]
+        if not rows:
+            return self.browse()
+        
+        service = self._get_call_data_service()
+        statuses = service.get_call_statuses(
+            [row['call_id'] for row in rows], max_workers=SYNC_MAX_WORKERS
+        )
+        
+        # Group conversations receiving identical values so each group is one write
+        groups = {}
+        for row in rows:
+            call_status = statuses[row['call_id']]
+            if call_status.get('status') == 'error':
+                _logger.warning(
+                    f"Error fetching call data for {row['call_id']}: {call_status.get('error', 'Unknown error')}"
+                )
+                continue
+            update_vals = self._prepare_call_sync_vals(call_status)
+            if update_vals:
+                key = _json_key(update_vals)
+                groups.setdefault(key, (update_vals, []))[1].append(row['id'])
+        
+        synced = self.browse()
+        for update_vals, ids in groups.values():
+            group = records.browse(ids)
+            group._apply_call_sync_vals(update_vals)
+            synced |= group
+        
+        return synced
+    
     def action_sync_call_data(self):
         """Sync call data from OmniDimension API"""
         self.ensure_one()
@@ -458,141 +711,19 @@ class ResumeConversation(models.Model):
             }
         
         try:
-            # Get telephony config
-            telephony_config = self.env['resume.telephony.config'].get_default_config()
-            if not telephony_config or telephony_config.provider_name != 'omnidimension_ai':
-                raise UserError('OmniDimension AI telephony configuration not found.')
-            
-            from ..services.omnidimension_ai_service import OmniDimensionAIService
-            
-            config = {
-                'api_key': telephony_config.account_sid or '',
-                'api_endpoint': telephony_config.api_endpoint,
-                'agent_id': telephony_config.agent_id or '',
-                'voice_id': telephony_config.voice_id or '',
-            }
-            
-            service = OmniDimensionAIService(config)
+            service = self._get_call_data_service()
             
-            # Get call status and details
-            call_status = service.get_call_status(self.call_id)
+            # Get call status and details; a manual sync always asks the API
+            call_status = service.get_call_status(self.call_id, use_cache=False)
             
             if call_status.get('status') == 'error':
                 raise UserError(f"Error fetching call data: {call_status.get('error', 'Unknown error')}")
             
             # Update conversation with fetched data
-            update_vals = {}
-            
-            # Update recording URL if available
-            if call_status.get('recording_url'):
-                update_vals['call_recording_url'] = call_status.get('recording_url')
-                update_vals['recording_url'] = call_status.get('recording_url')
-            
-            # Update transcript if available
-            if call_status.get('transcript'):
-                update_vals['transcript'] = call_status.get('transcript')
-            
-            # Update summary if available
-            if call_status.get('summary'):
-                update_vals['summary'] = call_status.get('summary', '')
-            
-            # Update sentiment if available (can be text or score)
-            if call_status.get('sentiment'):
-                sentiment_text = call_status.get('sentiment', '').lower()
-                if 'positive' in sentiment_text:
-                    update_vals['sentiment'] = 'positive'
-                elif 'negative' in sentiment_text:
-                    update_vals['sentiment'] = 'negative'
-                else:
-                    update_vals['sentiment'] = 'neutral'
-            elif call_status.get('sentiment_score') is not None:
-                # Convert sentiment score to text
-                sentiment_score = call_status.get('sentiment_score', 0)
-                if sentiment_score > 0.3:
-                    update_vals['sentiment'] = 'positive'
-                elif sentiment_score < -0.3:
-                    update_vals['sentiment'] = 'negative'
-                else:
-                    update_vals['sentiment'] = 'neutral'
-            
-            # Update collected data if available - ENHANCED to capture all fields
-            collected_data = call_status.get('collected_data', {})
-            if not collected_data:
-                # Try alternative keys
-                collected_data = call_status.get('collected_info', {}) or call_status.get('data', {}) or call_status.get('metadata', {})
-            
-            if collected_data:
-                # Handle string JSON
-                if isinstance(collected_data, str):
-                    try:
-                        collected_data = json.loads(collected_data)
-                    except:
-                        try:
-                            collected_data = json.loads(json.loads(collected_data))
-                        except:
-                            collected_data = {}
-                
-                # Store as JSON
-                update_vals['collected_info'] = json.dumps(collected_data)
-                
-                # Extract specific fields - ensure ALL fields are populated
-                if 'introduction' in collected_data or 'brief_introduction' in collected_data:
-                    intro = collected_data.get('introduction') or collected_data.get('brief_introduction', '')
-                    if intro:
-                        update_vals['brief_introduction'] = intro
-                        update_vals['introduction'] = intro
-                if 'current_position' in collected_data:
-                    pos = collected_data.get('current_position', '')
-                    if pos:
-                        update_vals['current_position'] = pos
-                if 'current_salary' in collected_data:
-                    sal = collected_data.get('current_salary', '')
-                    if sal:
-                        update_vals['current_salary'] = sal
-                if 'expected_salary' in collected_data:
-                    exp_sal = collected_data.get('expected_salary', '')
-                    if exp_sal:
-                        update_vals['expected_salary'] = exp_sal
-                if 'notice_period' in collected_data:
-                    notice = collected_data.get('notice_period', '')
-                    if notice:
-                        update_vals['notice_period'] = notice
-                
-                # Update detected language if available
-                if 'detected_language' in collected_data:
-                    update_vals['detected_language'] = collected_data.get('detected_language')
-            
-            # Update duration if available
-            if call_status.get('duration'):
-                update_vals['duration'] = call_status.get('duration', 0) / 60.0  # Convert to minutes
-            
-            # Update status
-            call_status_value = call_status.get('status', 'completed')
-            if call_status_value == 'completed':
-                update_vals['status'] = 'completed'
-            elif call_status_value in ['in_progress', 'ringing', 'answered']:
-                update_vals['status'] = 'in_progress'
+            update_vals = self._prepare_call_sync_vals(call_status)
             
             if update_vals:
-                self.write(update_vals)
-                
-                # Update candidate fields with synced data
-                if self.candidate_id:
-                    candidate_updates = {}
-                    if 'introduction' in update_vals:
-                        candidate_updates['introduction'] = update_vals['introduction']
-                    if 'current_position' in update_vals:
-                        candidate_updates['current_position'] = update_vals['current_position']
-                    if 'current_salary' in update_vals:
-                        candidate_updates['current_salary'] = update_vals['current_salary']
-                    if 'expected_salary' in update_vals:
-                        candidate_updates['expected_salary'] = update_vals['expected_salary']
-                    if 'notice_period' in update_vals:
-                        candidate_updates['notice_period'] = update_vals['notice_period']
-                    
-                    if candidate_updates:
-                        self.candidate_id.write(candidate_updates)
-                        _logger.info(f"✅ Updated candidate {self.candidate_id.id} with synced data")
+                self._apply_call_sync_vals(update_vals)
                 
                 return {
                     'type': 'ir.actions.client',
@@ -617,8 +748,5 @@ class ResumeConversation(models.Model):
                 }
                 
         except Exception as e:
-            import logging
-            _logger = logging.getLogger(__name__)
             _logger.error(f"Error syncing call data: {e}", exc_info=True)
             raise UserError(f'Failed to sync call data: {str(e)}')
-
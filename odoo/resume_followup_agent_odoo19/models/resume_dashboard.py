@@ -1,8 +1,9 @@
 # -*- coding: utf-8 -*-
 
 import logging
-from odoo import models, fields, api
-from odoo.exceptions import UserError
+import time
+
+from odoo import models, fields, api, tools
 
 _logger = logging.getLogger(__name__)
 
@@ -10,106 +11,118 @@ _logger = logging.getLogger(__name__)
 class ResumeDashboard(models.TransientModel):
     _name = 'resume.dashboard'
     _description = 'Resume Follow-Up Dashboard Statistics'
-    _log_access = True  # Required for TransientModels
+    _log_access = True  # Odoo refuses transient models without it: the vacuum purges by write_date
 
     # Sentiment Statistics
-    total_interviews = fields.Integer(string='Total Interviews', compute='_compute_all_stats', store=False)
-    positive_count = fields.Integer(string='Positive Interviews', compute='_compute_all_stats', store=False)
-    negative_count = fields.Integer(string='Negative Interviews', compute='_compute_all_stats', store=False)
-    neutral_count = fields.Integer(string='Neutral Interviews', compute='_compute_all_stats', store=False)
-    positive_percentage = fields.Float(string='Positive %', compute='_compute_all_stats', digits=(5, 2), store=False)
-    negative_percentage = fields.Float(string='Negative %', compute='_compute_all_stats', digits=(5, 2), store=False)
-    neutral_percentage = fields.Float(string='Neutral %', compute='_compute_all_stats', digits=(5, 2), store=False)
+    total_interviews = fields.Integer(string='Total Interviews')
+    positive_count = fields.Integer(string='Positive Interviews')
+    negative_count = fields.Integer(string='Negative Interviews')
+    neutral_count = fields.Integer(string='Neutral Interviews')
+    positive_percentage = fields.Float(string='Positive %', digits=(5, 2))
+    negative_percentage = fields.Float(string='Negative %', digits=(5, 2))
+    neutral_percentage = fields.Float(string='Neutral %', digits=(5, 2))
 
     # Salary Statistics
-    avg_current_salary = fields.Float(string='Avg Current Salary', compute='_compute_all_stats', digits=(12, 2), store=False)
-    avg_expected_salary = fields.Float(string='Avg Expected Salary', compute='_compute_all_stats', digits=(12, 2), store=False)
-    min_current_salary = fields.Float(string='Min Current Salary', compute='_compute_all_stats', digits=(12, 2), store=False)
-    max_current_salary = fields.Float(string='Max Current Salary', compute='_compute_all_stats', digits=(12, 2), store=False)
-    min_expected_salary = fields.Float(string='Min Expected Salary', compute='_compute_all_stats', digits=(12, 2), store=False)
-    max_expected_salary = fields.Float(string='Max Expected Salary', compute='_compute_all_stats', digits=(12, 2), store=False)
+    avg_current_salary = fields.Float(string='Avg Current Salary', digits=(12, 2))
+    avg_expected_salary = fields.Float(string='Avg Expected Salary', digits=(12, 2))
+    min_current_salary = fields.Float(string='Min Current Salary', digits=(12, 2))
+    max_current_salary = fields.Float(string='Max Current Salary', digits=(12, 2))
+    min_expected_salary = fields.Float(string='Min Expected Salary', digits=(12, 2))
+    max_expected_salary = fields.Float(string='Max Expected Salary', digits=(12, 2))
 
-    @api.model
-    def create(self, vals):
-        """Auto-compute stats when dashboard record is created"""
-        record = super().create(vals or {})
-        record._compute_all_stats()
-        return record
+    @api.model_create_multi
+    def create(self, vals_list):
+        """Fill in the stats when dashboard records are created (collected once per batch)"""
+        stats = self._collect_stats()
+        return super().create([{**vals, **stats} for vals in vals_list])
     
-    def _parse_salary(self, salary_str):
-        """Parse salary string to float (handles formats like '1,00,000', '50000', etc.)"""
-        if not salary_str:
-            return 0.0
-        try:
-            # Remove commas and spaces
-            cleaned = str(salary_str).replace(',', '').replace(' ', '').strip()
-            # Try to extract number if there's text
-            import re
-            numbers = re.findall(r'\d+', cleaned)
-            if numbers:
-                return float(numbers[0])
-            return 0.0
-        except (ValueError, TypeError):
-            return 0.0
+    @api.model
+    def _cache_bucket(self):
+        """Minute bucket, so cached stats expire on their own within a minute"""
+        return int(time.time() // 60)
 
-    def _compute_all_stats(self):
-        """Compute all statistics (sentiment and salary)"""
-        conversations = self.env['resume.conversation'].search([
-            ('status', '=', 'completed')
-        ])
+    @api.model
+    @tools.ormcache('tuple(sorted(self.env.companies.ids))', 'self._cache_bucket()')
+    def _get_stats_cached(self):
+        """Aggregate dashboard statistics, cached per set of active companies and minute
+
+        Entries expire with the minute bucket rather than being invalidated on
+        every conversation change. The returned dict is shared, callers must
+        not mutate it.
+        """
+        # Aggregates only: skip record rules, scope to the cache key's companies explicitly
+        company_ids = sorted(self.env.companies.ids)
+        Conversation = self.env['resume.conversation'].sudo()
+        domain = [('status', '=', 'completed'), ('company_id', 'in', company_ids + [False])]
         
-        # Sentiment Statistics
-        total = len(conversations)
-        positive = len(conversations.filtered(lambda c: c.sentiment == 'positive'))
-        negative = len(conversations.filtered(lambda c: c.sentiment == 'negative'))
-        neutral = len(conversations.filtered(lambda c: c.sentiment == 'neutral'))
+        # Sentiment Statistics - one GROUP BY query instead of loading every conversation
+        counts = dict(Conversation._read_group(domain, ['sentiment'], ['__count']))
+        total = sum(counts.values())
+        positive = counts.get('positive', 0)
+        negative = counts.get('negative', 0)
+        neutral = counts.get('neutral', 0)
         
-        # Salary Statistics
-        current_salaries = []
-        expected_salaries = []
+        # Salary Statistics - parsed and aggregated in Postgres: salary strings like
+        # '1,00,000' or '50000 INR' count as their first run of digits, zeros are ignored
+        Conversation.flush_model(['status', 'company_id', 'current_salary', 'expected_salary', 'duration'])
+        self.env.cr.execute("""
+            SELECT AVG(current_salary), MIN(current_salary), MAX(current_salary),
+                   AVG(expected_salary), MIN(expected_salary), MAX(expected_salary),
+                   AVG(duration) FILTER (WHERE duration > 0)
+              FROM (
+                    SELECT NULLIF(SUBSTRING(REGEXP_REPLACE(current_salary, '[, ]', '', 'g') FROM '[0-9]+')::numeric, 0)
+                               AS current_salary,
+                           NULLIF(SUBSTRING(REGEXP_REPLACE(expected_salary, '[, ]', '', 'g') FROM '[0-9]+')::numeric, 0)
+                               AS expected_salary,
+                           duration
+                      FROM resume_conversation
+                     WHERE status = 'completed'
+                       AND (company_id = ANY(%s) OR company_id IS NULL)
+                   ) salaries
+        """, [company_ids])
+        (
+            avg_current, min_current, max_current,
+            avg_expected, min_expected, max_expected,
+            avg_duration,
+        ) = (float(value or 0.0) for value in self.env.cr.fetchone())
         
-        for conv in conversations:
-            if conv.current_salary:
-                salary = self._parse_salary(conv.current_salary)
-                if salary > 0:
-                    current_salaries.append(salary)
-            
-            if conv.expected_salary:
-                salary = self._parse_salary(conv.expected_salary)
-                if salary > 0:
-                    expected_salaries.append(salary)
+        return {
+            'total': total,
+            'positive': positive,
+            'negative': negative,
+            'neutral': neutral,
+            'avg_current': avg_current,
+            'min_current': min_current,
+            'max_current': max_current,
+            'avg_expected': avg_expected,
+            'min_expected': min_expected,
+            'max_expected': max_expected,
+            'avg_duration': avg_duration,
+        }
+
+    @api.model
+    def _collect_stats(self):
+        """Collect all statistics (sentiment and salary) as dashboard field values"""
+        stats = self._get_stats_cached()
+        total = stats['total']
+        positive = stats['positive']
+        negative = stats['negative']
+        neutral = stats['neutral']
         
-        for record in self:
+        return {
             # Sentiment stats
-            record.total_interviews = total
-            record.positive_count = positive
-            record.negative_count = negative
-            record.neutral_count = neutral
-            
-            if total > 0:
-                record.positive_percentage = (positive / total) * 100
-                record.negative_percentage = (negative / total) * 100
-                record.neutral_percentage = (neutral / total) * 100
-            else:
-                record.positive_percentage = 0.0
-                record.negative_percentage = 0.0
-                record.neutral_percentage = 0.0
-            
+            'total_interviews': total,
+            'positive_count': positive,
+            'negative_count': negative,
+            'neutral_count': neutral,
+            'positive_percentage': (positive / total) * 100 if total > 0 else 0.0,
+            'negative_percentage': (negative / total) * 100 if total > 0 else 0.0,
+            'neutral_percentage': (neutral / total) * 100 if total > 0 else 0.0,
             # Salary stats
-            if current_salaries:
-                record.avg_current_salary = sum(current_salaries) / len(current_salaries)
-                record.min_current_salary = min(current_salaries)
-                record.max_current_salary = max(current_salaries)
-            else:
-                record.avg_current_salary = 0.0
-                record.min_current_salary = 0.0
-                record.max_current_salary = 0.0
-            
-            if expected_salaries:
-                record.avg_expected_salary = sum(expected_salaries) / len(expected_salaries)
-                record.min_expected_salary = min(expected_salaries)
-                record.max_expected_salary = max(expected_salaries)
-            else:
-                record.avg_expected_salary = 0.0
-                record.min_expected_salary = 0.0
-                record.max_expected_salary = 0.0
+            'avg_current_salary': stats['avg_current'],
+            'min_current_salary': stats['min_current'],
+            'max_current_salary': stats['max_current'],
+            'avg_expected_salary': stats['avg_expected'],
+            'min_expected_salary': stats['min_expected'],
+            'max_expected_salary': stats['max_expected'],
+        }
@@ -5,8 +5,82 @@ from odoo import models, fields, api
 from odoo.exceptions import UserError
 from ..utils.language_detector import LanguageDetector
 
+try:
+    from ..services.omnidimension_ai_service import OmniDimensionAIService
+except ImportError:
+    OmniDimensionAIService = None
+
 _logger = logging.getLogger(__name__)
 
+# Connection test outcome -> (notification title, message heading, error label, hint)
+_CONNECTION_TEST_MESSAGES = {
+    'warning': (
+        'Connection Test Warning',
+        "⚠️ Connection Test Warning",
+        "Note",
+        "💡 The endpoint might still work for authenticated API calls.\n"
+        "The connection timeout could be due to:\n"
+        "1. Firewall restrictions\n"
+        "2. The endpoint requiring authentication\n"
+        "3. Network connectivity issues\n\n"
+        "Try making an actual API call (e.g., create agent) to verify if it works.\n\n"
+        "If you continue to have issues:\n"
+        "1. Log into your OmniDimension AI dashboard\n"
+        "2. Check Settings → API or Documentation section\n"
+        "3. Verify the correct API endpoint URL\n"
+        "4. Update the 'API Endpoint' field if needed",
+    ),
+    'error': (
+        'Connection Test Failed',
+        "❌ Connection Test Failed",
+        "Error",
+        "🔍 To fix this:\n"
+        "1. Log into your OmniDimension AI dashboard\n"
+        "2. Go to Settings → API or Documentation section\n"
+        "3. Find the correct API endpoint URL\n"
+        "4. Update the 'API Endpoint' field above\n\n"
+        "💡 Common endpoints:\n"
+        "   - https://api.omnidim.io/api/v1\n"
+        "   - https://www.omnidim.io/api/v1\n"
+        "   Check your dashboard for the exact endpoint.",
+    ),
+}
+
+# Context breakdown sections sent on agent creation: (title, body, is_enabled).
+# Bodies with {placeholders} are filled from the agent settings, the rest are sent as is.
+_CONTEXT_TEMPLATES = (
+    (
+        "Agent Role & Context (MANDATORY for Outbound agents)",
+        "You are a representative from {company_name} calling individuals who submitted a form expressing interest in the {position}. Your goal is to collect additional information from these individuals to complete their application. You are contacting recent form submitters (users) who are interested in pursuing a job at your company.",
+        True,
+    ),
+    (
+        "Introduction",
+        "Introduce yourself by name and clarify your role: 'Hi [user_name], this is {agent_name} from {company_name}. I hope I'm not catching you at a bad time. Please note that we prefer to conduct this conversation in English, but if you're more comfortable speaking in another language (such as Gujarati, Hindi, or any other language), please feel free to do so, and I'll continue the conversation in the language you prefer.' Then state your purpose: 'I'm reaching out to follow up on the resume you submitted for the {job_title} position.' Wait for confirmation that it's a good time to talk. IMPORTANT LANGUAGE DETECTION: After the candidate responds, automatically detect the language they are speaking (Gujarati, Hindi, English, or any other language) and continue the ENTIRE conversation in that detected language. If they respond in Gujarati, respond in Gujarati for ALL subsequent questions. If they respond in Hindi, respond in Hindi for ALL subsequent questions. If they respond in English, continue in English. Adapt your language immediately based on their first response and maintain that language throughout the entire conversation. If a 'preferred_language' is specified in the call_context metadata, use that language from the start instead of English.",
+        True,
+    ),
+    (
+        "Purpose Statement",
+        "Explain the purpose clearly: 'We need to gather a few more pieces of information to complete your application. This will help us move forward in the recruitment process.' Ensure the user is comfortable with this call and confirm their willingness to proceed with the questions.",
+        True,
+    ),
+    (
+        "Information Gathering",
+        "Politely and clearly ask each of the following questions, allowing time for the user to answer each one:\n- 'Could you please give us a brief introduction about yourself?'\n- 'May I know your current position?'\n- 'What is your current salary?'\n- 'What would be your expected salary for this role?'\n- 'What is your notice period with your current employer?' Acknowledge each response: 'Thank you for sharing that information.'",
+        True,
+    ),
+    (
+        "Language Detection and Multi-Language Support",
+        "CRITICAL LANGUAGE DETECTION INSTRUCTIONS: After the candidate responds to your greeting, automatically detect the language they are speaking. The candidate may respond in English, Gujarati, Hindi, or any other language. You MUST:\n1. Detect the language from their first response (listen for Gujarati script, Hindi/Devanagari script, or English)\n2. Immediately switch to speaking in the SAME language they used\n3. Continue the ENTIRE conversation in that detected language\n4. If they speak in Gujarati, respond in Gujarati for all subsequent messages\n5. If they speak in Hindi, respond in Hindi for all subsequent messages\n6. If they speak in English, continue in English\n7. Do NOT ask which language they prefer - just detect and adapt automatically\n8. Maintain the same professional tone and information gathering goals regardless of language\n9. Translate all your questions and responses to match their language preference\n10. If a preferred_language is provided in call_context, use that language from the start\n11. If preferred_language is 'auto' or not provided, detect from candidate's first response\n12. Store the detected language in the conversation metadata as 'detected_language'",
+        True,
+    ),
+    (
+        "Conclusion and Closing",
+        "Thank the user for their time and provide closure: 'Thank you for providing these details. This information helps us proceed with your application process. If we need any more information, we'll be in touch. Have a fantastic day!' Remember to use the same language the candidate has been using throughout the conversation.",
+        True,
+    ),
+)
+
 
 class ResumeTelephonyConfig(models.Model):
     _name = 'resume.telephony.config'
@@ -136,6 +210,20 @@ class ResumeTelephonyConfig(models.Model):
         config = self.search([('active', '=', True)], limit=1)
         return config
     
+    @api.model
+    def _notification(self, title, message, notification_type):
+        """Sticky display_notification client action"""
+        return {
+            'type': 'ir.actions.client',
+            'tag': 'display_notification',
+            'params': {
+                'title': title,
+                'message': message,
+                'type': notification_type,
+                'sticky': True,
+            }
+        }
+    
     def action_test_connection(self):
         """Test connection to the API endpoint"""
         self.ensure_one()
@@ -143,15 +231,17 @@ class ResumeTelephonyConfig(models.Model):
         if self.provider_name != 'omnidimension_ai':
             raise UserError('Connection test is only available for OmniDimension AI provider.')
         
-        if not self.api_endpoint:
+        endpoint = self.api_endpoint
+        if not endpoint:
             raise UserError('Please enter an API Endpoint URL first.')
         
+        if OmniDimensionAIService is None:
+            raise UserError('OmniDimension AI service is not available. Please check the module installation.')
+        
         try:
-            from ..services.omnidimension_ai_service import OmniDimensionAIService
-            
             config = {
                 'api_key': self.account_sid or '',
-                'api_endpoint': self.api_endpoint,
+                'api_endpoint': endpoint,
                 'agent_id': self.agent_id or '',
                 'voice_id': self.voice_id or '',
             }
@@ -162,76 +252,29 @@ class ResumeTelephonyConfig(models.Model):
             status = result.get('status', 'error')
             
             if status == 'success':
-                return {
-                    'type': 'ir.actions.client',
-                    'tag': 'display_notification',
-                    'params': {
-                        'title': 'Connection Test Successful',
-                        'message': f"✅ Successfully connected to {self.api_endpoint}\n{result.get('message', '')}",
-                        'type': 'success',
-                        'sticky': True,
-                    }
-                }
-            elif status == 'warning':
-                # DNS works but connection timed out - this might still work for authenticated calls
-                error_msg = result.get('error', 'Unknown error')
-                dns_status = result.get('dns_status', '')
-                
-                detailed_msg = f"⚠️ Connection Test Warning\n\n"
-                if dns_status:
-                    detailed_msg += f"{dns_status}\n\n"
-                detailed_msg += f"Note: {error_msg}\n\n"
-                detailed_msg += f"Endpoint: {self.api_endpoint}\n\n"
-                detailed_msg += (
-                    "💡 The endpoint might still work for authenticated API calls.\n"
-                    "The connection timeout could be due to:\n"
-                    "1. Firewall restrictions\n"
-                    "2. The endpoint requiring authentication\n"
-                    "3. Network connectivity issues\n\n"
-                    "Try making an actual API call (e.g., create agent) to verify if it works.\n\n"
-                    "If you continue to have issues:\n"
-                    "1. Log into your OmniDimension AI dashboard\n"
-                    "2. Check Settings → API or Documentation section\n"
-                    "3. Verify the correct API endpoint URL\n"
-                    "4. Update the 'API Endpoint' field if needed"
+                return self._notification(
+                    'Connection Test Successful',
+                    f"✅ Successfully connected to {endpoint}\n{result.get('message', '')}",
+                    'success',
                 )
+            
+            # 'warning': DNS works but connection timed out - this might still work for authenticated calls
+            if status != 'warning':
+                status = 'error'
+            title, heading, label, hint = _CONNECTION_TEST_MESSAGES[status]
+            dns_status = result.get('dns_status', '')
+            msg_parts = [heading]
+            if dns_status:
+                msg_parts.append(dns_status)
+            msg_parts.append(f"{label}: {result.get('error', 'Unknown error')}")
+            msg_parts.append(f"Endpoint: {endpoint}")
+            msg_parts.append(hint)
+            detailed_msg = '\n\n'.join(msg_parts)
+            
+            if status == 'warning':
+                return self._notification(title, detailed_msg, 'warning')
+            raise UserError(detailed_msg)
                 
-                return {
-                    'type': 'ir.actions.client',
-                    'tag': 'display_notification',
-                    'params': {
-                        'title': 'Connection Test Warning',
-                        'message': detailed_msg,
-                        'type': 'warning',
-                        'sticky': True,
-                    }
-                }
-            else:
-                # Actual error
-                error_msg = result.get('error', 'Unknown error')
-                dns_status = result.get('dns_status', '')
-                
-                detailed_msg = f"❌ Connection Test Failed\n\n"
-                if dns_status:
-                    detailed_msg += f"{dns_status}\n\n"
-                detailed_msg += f"Error: {error_msg}\n\n"
-                detailed_msg += f"Endpoint: {self.api_endpoint}\n\n"
-                detailed_msg += (
-                    "🔍 To fix this:\n"
-                    "1. Log into your OmniDimension AI dashboard\n"
-                    "2. Go to Settings → API or Documentation section\n"
-                    "3. Find the correct API endpoint URL\n"
-                    "4. Update the 'API Endpoint' field above\n\n"
-                    "💡 Common endpoints:\n"
-                    "   - https://api.omnidim.io/api/v1\n"
-                    "   - https://www.omnidim.io/api/v1\n"
-                    "   Check your dashboard for the exact endpoint."
-                )
-                
-                raise UserError(detailed_msg)
-                
-        except ImportError:
-            raise UserError('OmniDimension AI service is not available. Please check the module installation.')
         except Exception as e:
             _logger.error(f"Connection test error: {e}", exc_info=True)
             raise UserError(f'Connection test failed: {str(e)}')
@@ -246,9 +289,10 @@ class ResumeTelephonyConfig(models.Model):
         if not self.account_sid:
             raise UserError('Please enter your API Key first.')
         
+        if OmniDimensionAIService is None:
+            raise UserError('OmniDimension AI service is not available. Please check the module installation.')
+        
         try:
-            from ..services.omnidimension_ai_service import OmniDimensionAIService
-            
             config = {
                 'api_key': self.account_sid or '',
                 'api_endpoint': self.api_endpoint,
@@ -263,8 +307,9 @@ class ResumeTelephonyConfig(models.Model):
             context_breakdown = self._build_context_breakdown(agent_settings)
             
             # Create agent
+            agent_name = self.agent_name
             result = service.create_agent(
-                name=self.agent_name or 'Resume Follow-Up Agent',
+                name=agent_name or 'Resume Follow-Up Agent',
                 welcome_message=self.welcome_message or '',
                 context_breakdown=context_breakdown,
                 call_type='Outgoing',
@@ -288,16 +333,11 @@ class ResumeTelephonyConfig(models.Model):
                 if agent_id:
                     self.agent_id = agent_id
                 
-                return {
-                    'type': 'ir.actions.client',
-                    'tag': 'display_notification',
-                    'params': {
-                        'title': 'Agent Created Successfully',
-                        'message': f"✅ Agent '{self.agent_name}' created successfully!\nAgent ID: {agent_id}\n\nThe Agent ID has been automatically saved to your configuration.",
-                        'type': 'success',
-                        'sticky': True,
-                    }
-                }
+                return self._notification(
+                    'Agent Created Successfully',
+                    f"✅ Agent '{agent_name}' created successfully!\nAgent ID: {agent_id}\n\nThe Agent ID has been automatically saved to your configuration.",
+                    'success',
+                )
             else:
                 error_msg = result.get('error', 'Unknown error')
                 raise UserError(f'Failed to create agent: {error_msg}')
@@ -320,38 +360,17 @@ class ResumeTelephonyConfig(models.Model):
     
     def _build_context_breakdown(self, agent_settings):
         """Build context breakdown from agent settings"""
-        context_breakdown = [
-            {
-                "title": "Agent Role & Context (MANDATORY for Outbound agents)",
-                "body": f"You are a representative from {agent_settings.company_name or '[company_name]'} calling individuals who submitted a form expressing interest in the {agent_settings.default_job_title or '[position]'}. Your goal is to collect additional information from these individuals to complete their application. You are contacting recent form submitters (users) who are interested in pursuing a job at your company.",
-                "is_enabled": True
-            },
-            {
-                "title": "Introduction",
-                "body": f"Introduce yourself by name and clarify your role: 'Hi [user_name], this is {agent_settings.agent_name or '[agent_name]'} from {agent_settings.company_name or '[company_name]'}. I hope I'm not catching you at a bad time. Please note that we prefer to conduct this conversation in English, but if you're more comfortable speaking in another language (such as Gujarati, Hindi, or any other language), please feel free to do so, and I'll continue the conversation in the language you prefer.' Then state your purpose: 'I'm reaching out to follow up on the resume you submitted for the {agent_settings.default_job_title or '[job_title]'} position.' Wait for confirmation that it's a good time to talk. IMPORTANT LANGUAGE DETECTION: After the candidate responds, automatically detect the language they are speaking (Gujarati, Hindi, English, or any other language) and continue the ENTIRE conversation in that detected language. If they respond in Gujarati, respond in Gujarati for ALL subsequent questions. If they respond in Hindi, respond in Hindi for ALL subsequent questions. If they respond in English, continue in English. Adapt your language immediately based on their first response and maintain that language throughout the entire conversation. If a 'preferred_language' is specified in the call_context metadata, use that language from the start instead of English.",
-                "is_enabled": True
-            },
-            {
-                "title": "Purpose Statement",
-                "body": "Explain the purpose clearly: 'We need to gather a few more pieces of information to complete your application. This will help us move forward in the recruitment process.' Ensure the user is comfortable with this call and confirm their willingness to proceed with the questions.",
-                "is_enabled": True
-            },
+        values = {
+            'company_name': agent_settings.company_name or '[company_name]',
+            'agent_name': agent_settings.agent_name or '[agent_name]',
+            'position': agent_settings.default_job_title or '[position]',
+            'job_title': agent_settings.default_job_title or '[job_title]',
+        }
+        return [
             {
-                "title": "Information Gathering",
-                "body": "Politely and clearly ask each of the following questions, allowing time for the user to answer each one:\n- 'Could you please give us a brief introduction about yourself?'\n- 'May I know your current position?'\n- 'What is your current salary?'\n- 'What would be your expected salary for this role?'\n- 'What is your notice period with your current employer?' Acknowledge each response: 'Thank you for sharing that information.'",
-                "is_enabled": True
-            },
-            {
-                "title": "Language Detection and Multi-Language Support",
-                "body": "CRITICAL LANGUAGE DETECTION INSTRUCTIONS: After the candidate responds to your greeting, automatically detect the language they are speaking. The candidate may respond in English, Gujarati, Hindi, or any other language. You MUST:\n1. Detect the language from their first response (listen for Gujarati script, Hindi/Devanagari script, or English)\n2. Immediately switch to speaking in the SAME language they used\n3. Continue the ENTIRE conversation in that detected language\n4. If they speak in Gujarati, respond in Gujarati for all subsequent messages\n5. If they speak in Hindi, respond in Hindi for all subsequent messages\n6. If they speak in English, continue in English\n7. Do NOT ask which language they prefer - just detect and adapt automatically\n8. Maintain the same professional tone and information gathering goals regardless of language\n9. Translate all your questions and responses to match their language preference\n10. If a preferred_language is provided in call_context, use that language from the start\n11. If preferred_language is 'auto' or not provided, detect from candidate's first response\n12. Store the detected language in the conversation metadata as 'detected_language'",
-                "is_enabled": True
-            },
-            {
-                "title": "Conclusion and Closing",
-                "body": "Thank the user for their time and provide closure: 'Thank you for providing these details. This information helps us proceed with your application process. If we need any more information, we'll be in touch. Have a fantastic day!' Remember to use the same language the candidate has been using throughout the conversation.",
-                "is_enabled": True
+                "title": title,
+                "body": body.format_map(values) if '{' in body else body,
+                "is_enabled": is_enabled
             }
+            for title, body, is_enabled in _CONTEXT_TEMPLATES
         ]
-        
-        return context_breakdown
-
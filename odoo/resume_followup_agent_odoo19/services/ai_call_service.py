@@ -1,16 +1,124 @@
 # -*- coding: utf-8 -*-
 
-import json
+import functools
 import logging
-from typing import Dict, Optional
+import re
+from bisect import bisect_left
+from collections import namedtuple
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
 
 _logger = logging.getLogger(__name__)
 
+# Keyword groups behind the sentiment, professionalism and interest scores.
+# A keyword counts once if it occurs anywhere in the lowercased transcript
+# (substring match), however many times it occurs.
+_KEYWORD_GROUPS = {
+    'positive': ('yes', 'great', 'excellent', 'interested', 'excited', 'perfect', 'wonderful'),
+    'negative': ('no', 'not', 'unfortunately', 'sorry', 'cannot', 'unable'),
+    'professional': ('thank you', 'please', 'appreciate', 'opportunity', 'experience'),
+    'high_interest': ('very interested', 'excited', 'perfect fit', 'looking forward', 'definitely'),
+    'low_interest': ('not sure', 'maybe', 'consider', 'think about'),
+    'not_interested': ('not interested', 'not looking', 'not available', 'decline'),
+}
+
+
+# Per-group counts are packed into one int, 8 bits per group in _KEYWORD_GROUPS
+# order, so tallying is one integer add per keyword. A group has fewer than
+# 256 keywords and each counts at most once, so lanes never overflow.
+_LANE_BITS = 8
+_LANE_MASK = (1 << _LANE_BITS) - 1
+_GROUP_SHIFTS = tuple(
+    (group, lane * _LANE_BITS) for lane, group in enumerate(_KEYWORD_GROUPS)
+)
+
+
+def _keyword_lanes():
+    """Map each keyword to its packed increment ('excited' counts in two groups)"""
+    lanes = {}
+    for group, shift in _GROUP_SHIFTS:
+        for keyword in _KEYWORD_GROUPS[group]:
+            lanes[keyword] = lanes.get(keyword, 0) + (1 << shift)
+    return lanes
+
+
+_KEYWORD_LANES = _keyword_lanes()
+
+
+@functools.cache
+def _get_automaton():
+    """Aho-Corasick automaton over every keyword, built on first use (None without pyahocorasick)
+
+    A single pass over the transcript finds all keywords, overlapping matches included.
+    """
+    if not ahocorasick:
+        return None
+    automaton = ahocorasick.Automaton()
+    for keyword in _KEYWORD_LANES:
+        automaton.add_word(keyword, keyword)
+    automaton.make_automaton()
+    return automaton
+
+
+# Communication score bonus for exceeding 0, 1 or 2 of the thresholds
+# (bisect_left counts the thresholds strictly below the value)
+_COMMUNICATION_WORD_THRESHOLDS = (200, 500)
+_COMMUNICATION_WORD_BONUSES = (0.0, 0.5, 1.0)
+_COMMUNICATION_DURATION_THRESHOLDS = (5, 10)
+_COMMUNICATION_DURATION_BONUSES = (0.0, 0.2, 0.5)
+
+# Engagement: each threshold a call exceeds on both word count and duration
+# (minutes) raises the level by one step
+_ENGAGEMENT_WORD_THRESHOLDS = (150, 300, 500)
+_ENGAGEMENT_DURATION_THRESHOLDS = (5, 7, 10)
+_ENGAGEMENT_LEVELS = ('low', 'medium', 'high', 'very_high')
+
+# A non-blank run between periods: one match per sentence that is not empty or whitespace
+_SENTENCE_RE = re.compile(r'[^.\s][^.]*')
+
+# Returned (as a copy) when analyze_call fails
+_DEFAULT_ANALYSIS = {
+    'communication_score': 0.0,
+    'sentiment_score': 0.0,
+    'engagement_level': 'low',
+    'response_time_avg': 0.0,
+    'clarity_score': 0.0,
+    'professionalism_score': 0.0,
+    'interest_level': 'moderate',
+    'analysis_text': 'Analysis unavailable',
+    'statistics': {},
+}
+
+# Transcript measurements shared by the analyze_call scorers, computed once per call
+_TranscriptFeatures = namedtuple('_TranscriptFeatures', ['word_count', 'question_count', 'keyword_counts'])
+
+
+def _tally_keywords(transcript_lower: str) -> dict[str, int]:
+    """Count the distinct keywords of each group present in the transcript"""
+    automaton = _get_automaton()
+    if automaton is not None:
+        found = {keyword for _end, keyword in automaton.iter(transcript_lower)}
+    else:
+        found = [keyword for keyword in _KEYWORD_LANES if keyword in transcript_lower]
+    packed = sum(map(_KEYWORD_LANES.__getitem__, found))
+    return {group: (packed >> shift) & _LANE_MASK for group, shift in _GROUP_SHIFTS}
+
+
+@functools.lru_cache(maxsize=128)
+def _analyze_call_cached(service_class, transcript, call_data_items):
+    """Memoized AICallService._analyze_call (the analysis does not depend on the service config)"""
+    return service_class({})._analyze_call(transcript, dict(call_data_items))
+
 
 class AICallService:
     """Service for AI-powered call analysis and statistics"""
 
-    def __init__(self, config: Dict):
+    __slots__ = ('config',)
+
+    def __init__(self, config: dict):
         """
         Initialize AI Call Service
 
@@ -18,11 +126,21 @@ class AICallService:
             config: Configuration dictionary with AI settings
         """
         self.config = config
-        self.ai_model = config.get('ai_model', 'openai')
-        self.api_key = config.get('ai_api_key', '')
-        self.endpoint = config.get('ai_endpoint', '')
 
-    def analyze_call(self, transcript: str, call_data: Dict) -> Dict:
+    # AI settings, read from the config on access (the heuristic analysis does not use them)
+    @property
+    def ai_model(self) -> str:
+        return self.config.get('ai_model', 'openai')
+
+    @property
+    def api_key(self) -> str:
+        return self.config.get('ai_api_key', '')
+
+    @property
+    def endpoint(self) -> str:
+        return self.config.get('ai_endpoint', '')
+
+    def analyze_call(self, transcript: str, call_data: dict) -> dict:
         """
         Analyze call transcript and generate statistics
 
@@ -33,43 +151,56 @@ class AICallService:
         Returns:
             Dictionary with analysis results
         """
+        # Memoized per (transcript, call_data): UI refreshes and report regeneration
+        # re-analyze the same call
+        try:
+            call_data_key = tuple(sorted(call_data.items()))
+            hash(call_data_key)
+        except (AttributeError, TypeError):
+            # No usable cache key (unhashable call data values)
+            return self._analyze_call(transcript, call_data)
+        analysis = _analyze_call_cached(type(self), transcript, call_data_key)
+        # The cached dict is shared between callers, hand out a copy
+        return {**analysis, 'statistics': dict(analysis['statistics'])}
+
+    def _analyze_call(self, transcript: str, call_data: dict) -> dict:
+        """Uncached analyze_call"""
         try:
             # Basic analysis (can be enhanced with actual AI API calls)
+            features = _TranscriptFeatures(
+                word_count=len(transcript.split()),
+                question_count=transcript.count('?'),
+                keyword_counts=_tally_keywords(transcript.lower()),
+            )
             analysis = {
-                'communication_score': self._calculate_communication_score(transcript, call_data),
-                'sentiment_score': self._calculate_sentiment(transcript),
-                'engagement_level': self._determine_engagement(transcript, call_data),
+                'communication_score': self._calculate_communication_score(features, call_data),
+                'sentiment_score': self._calculate_sentiment(features),
+                'engagement_level': self._determine_engagement(features, call_data),
                 'response_time_avg': call_data.get('avg_response_time', 0),
-                'clarity_score': self._calculate_clarity(transcript),
-                'professionalism_score': self._calculate_professionalism(transcript),
-                'interest_level': self._determine_interest(transcript),
-                'analysis_text': self._generate_analysis_text(transcript, call_data),
-                'statistics': self._generate_statistics(transcript, call_data)
+                'clarity_score': self._calculate_clarity(transcript, features),
+                'professionalism_score': self._calculate_professionalism(features),
+                'interest_level': self._determine_interest(features),
             }
+            # The summary text reuses the scores above instead of recomputing them
+            analysis['analysis_text'] = self._generate_analysis_text(call_data, analysis)
+            analysis['statistics'] = self._generate_statistics(transcript, features, call_data)
 
             return analysis
         except Exception as e:
             _logger.error(f"Error analyzing call: {e}")
             return self._get_default_analysis()
 
-    def _calculate_communication_score(self, transcript: str, call_data: Dict) -> float:
+    def _calculate_communication_score(self, features: _TranscriptFeatures, call_data: dict) -> float:
         """Calculate overall communication score (0-10)"""
         # Simple heuristic-based scoring (can be replaced with AI)
         score = 7.0  # Base score
 
         # Adjust based on transcript length (more conversation = better)
-        word_count = len(transcript.split())
-        if word_count > 500:
-            score += 1.0
-        elif word_count > 200:
-            score += 0.5
+        score += _COMMUNICATION_WORD_BONUSES[bisect_left(_COMMUNICATION_WORD_THRESHOLDS, features.word_count)]
 
         # Adjust based on duration (longer calls often indicate better engagement)
         duration = call_data.get('duration', 0)
-        if duration > 10:
-            score += 0.5
-        elif duration > 5:
-            score += 0.2
+        score += _COMMUNICATION_DURATION_BONUSES[bisect_left(_COMMUNICATION_DURATION_THRESHOLDS, duration)]
 
         # Adjust based on questions answered
         questions_answered = call_data.get('questions_answered', 0)
@@ -80,15 +211,11 @@ class AICallService:
 
         return min(10.0, max(0.0, score))
 
-    def _calculate_sentiment(self, transcript: str) -> float:
+    def _calculate_sentiment(self, features: _TranscriptFeatures) -> float:
         """Calculate sentiment score (-1 to 1)"""
         # Simple keyword-based sentiment (can be enhanced with NLP)
-        positive_words = ['yes', 'great', 'excellent', 'interested', 'excited', 'perfect', 'wonderful']
-        negative_words = ['no', 'not', 'unfortunately', 'sorry', 'cannot', 'unable']
-
-        transcript_lower = transcript.lower()
-        positive_count = sum(1 for word in positive_words if word in transcript_lower)
-        negative_count = sum(1 for word in negative_words if word in transcript_lower)
+        positive_count = features.keyword_counts['positive']
+        negative_count = features.keyword_counts['negative']
 
         total = positive_count + negative_count
         if total == 0:
@@ -98,101 +225,92 @@ class AICallService:
         sentiment = (positive_count - negative_count) / max(total, 1)
         return max(-1.0, min(1.0, sentiment))
 
-    def _determine_engagement(self, transcript: str, call_data: Dict) -> str:
+    def _determine_engagement(self, features: _TranscriptFeatures, call_data: dict) -> str:
         """Determine engagement level"""
-        word_count = len(transcript.split())
+        word_count = features.word_count
         duration = call_data.get('duration', 0)
 
-        # High engagement indicators
-        if word_count > 500 and duration > 10:
-            return 'very_high'
-        elif word_count > 300 and duration > 7:
-            return 'high'
-        elif word_count > 150 and duration > 5:
-            return 'medium'
-        else:
-            return 'low'
+        # bisect_left counts the thresholds strictly below the value
+        level = min(
+            bisect_left(_ENGAGEMENT_WORD_THRESHOLDS, word_count),
+            bisect_left(_ENGAGEMENT_DURATION_THRESHOLDS, duration),
+        )
+        return _ENGAGEMENT_LEVELS[level]
 
-    def _calculate_clarity(self, transcript: str) -> float:
+    def _calculate_clarity(self, transcript: str, features: _TranscriptFeatures) -> float:
         """Calculate clarity score (0-10)"""
         # Simple heuristic (can be enhanced with NLP)
         score = 7.0
 
-        # Check for complete sentences
-        sentences = transcript.split('.')
-        if len(sentences) > 5:
+        # Check for complete sentences (more than 5 '.'-separated fragments)
+        if transcript.count('.') >= 5:
             score += 1.0
 
         # Check for question marks (indicates engagement)
-        if '?' in transcript:
+        if features.question_count:
             score += 0.5
 
         return min(10.0, max(0.0, score))
 
-    def _calculate_professionalism(self, transcript: str) -> float:
+    def _calculate_professionalism(self, features: _TranscriptFeatures) -> float:
         """Calculate professionalism score (0-10)"""
         score = 7.0
 
         # Professional language indicators
-        professional_words = ['thank you', 'please', 'appreciate', 'opportunity', 'experience']
-        professional_count = sum(1 for word in professional_words if word in transcript.lower())
+        professional_count = features.keyword_counts['professional']
 
         score += min(2.0, professional_count * 0.3)
 
         return min(10.0, max(0.0, score))
 
-    def _determine_interest(self, transcript: str) -> str:
+    def _determine_interest(self, features: _TranscriptFeatures) -> str:
         """Determine candidate interest level"""
-        transcript_lower = transcript.lower()
+        keyword_counts = features.keyword_counts
 
-        high_interest_words = ['very interested', 'excited', 'perfect fit', 'looking forward', 'definitely']
-        low_interest_words = ['not sure', 'maybe', 'consider', 'think about']
-        not_interested_words = ['not interested', 'not looking', 'not available', 'decline']
-
-        high_count = sum(1 for phrase in high_interest_words if phrase in transcript_lower)
-        low_count = sum(1 for phrase in low_interest_words if phrase in transcript_lower)
-        not_count = sum(1 for phrase in not_interested_words if phrase in transcript_lower)
-
-        if not_count > 0:
+        # Any not-interested phrase wins, the other groups are not looked at
+        if keyword_counts['not_interested']:
             return 'not_interested'
-        elif high_count >= 2:
+
+        high_count = keyword_counts['high_interest']
+        if high_count >= 2:
             return 'very_high'
         elif high_count >= 1:
             return 'high'
-        elif low_count > 0:
+        elif keyword_counts['low_interest']:
             return 'low'
         else:
             return 'moderate'
 
-    def _generate_analysis_text(self, transcript: str, call_data: Dict) -> str:
-        """Generate human-readable analysis text"""
+    def _generate_analysis_text(self, call_data: dict, scores: dict) -> str:
+        """Generate human-readable analysis text from the scores computed by analyze_call"""
         duration = call_data.get('duration', 0)
         questions_answered = call_data.get('questions_answered', 0)
         total_questions = call_data.get('total_questions', 0)
 
-        analysis = f"""
-Call Analysis Summary:
-- Call Duration: {duration:.1f} minutes
-- Questions Answered: {questions_answered}/{total_questions}
-- Communication Quality: {'Good' if self._calculate_communication_score(transcript, call_data) > 7 else 'Needs Improvement'}
-- Candidate Engagement: {self._determine_engagement(transcript, call_data).replace('_', ' ').title()}
-- Interest Level: {self._determine_interest(transcript).replace('_', ' ').title()}
-
-Overall Assessment:
-The candidate demonstrated {'strong' if self._calculate_communication_score(transcript, call_data) > 7 else 'moderate'} communication skills
-and showed {'high' if self._determine_interest(transcript) in ['high', 'very_high'] else 'moderate'} interest in the position.
-        """
-        return analysis.strip()
-
-    def _generate_statistics(self, transcript: str, call_data: Dict) -> Dict:
+        good_communication = scores['communication_score'] > 7
+        interest_level = scores['interest_level']
+
+        return '\n'.join((
+            "Call Analysis Summary:",
+            f"- Call Duration: {duration:.1f} minutes",
+            f"- Questions Answered: {questions_answered}/{total_questions}",
+            f"- Communication Quality: {'Good' if good_communication else 'Needs Improvement'}",
+            f"- Candidate Engagement: {scores['engagement_level'].replace('_', ' ').title()}",
+            f"- Interest Level: {interest_level.replace('_', ' ').title()}",
+            "",
+            "Overall Assessment:",
+            f"The candidate demonstrated {'strong' if good_communication else 'moderate'} communication skills",
+            f"and showed {'high' if interest_level in ('high', 'very_high') else 'moderate'} interest in the position.",
+        ))
+
+    def _generate_statistics(self, transcript: str, features: _TranscriptFeatures, call_data: dict) -> dict:
         """Generate detailed statistics"""
-        word_count = len(transcript.split())
-        sentences = transcript.split('.')
-        questions = transcript.count('?')
+        word_count = features.word_count
+        questions = features.question_count
 
         return {
             'word_count': word_count,
-            'sentence_count': len([s for s in sentences if s.strip()]),
+            'sentence_count': sum(1 for _sentence in _SENTENCE_RE.finditer(transcript)),
             'question_count': questions,
             'duration_minutes': call_data.get('duration', 0),
             'questions_asked': call_data.get('total_questions', 0),
@@ -201,17 +319,7 @@ and showed {'high' if self._determine_interest(transcript) in ['high', 'very_hig
             'words_per_minute': word_count / max(call_data.get('duration', 1), 1)
         }
 
-    def _get_default_analysis(self) -> Dict:
+    def _get_default_analysis(self) -> dict:
         """Return default analysis if error occurs"""
-        return {
-            'communication_score': 0.0,
-            'sentiment_score': 0.0,
-            'engagement_level': 'low',
-            'response_time_avg': 0.0,
-            'clarity_score': 0.0,
-            'professionalism_score': 0.0,
-            'interest_level': 'moderate',
-            'analysis_text': 'Analysis unavailable',
-            'statistics': {}
-        }
-
+        # Fresh top-level and statistics dicts, callers may update the result
+        return {**_DEFAULT_ANALYSIS, 'statistics': {}}
@@ -1,59 +1,269 @@
 # -*- coding: utf-8 -*-
 
+import copy
 import logging
-import requests
 import json
-from typing import Dict, Optional, List
+import re
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+from typing import Dict, List
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 _logger = logging.getLogger(__name__)
 
-# Try to import the Omnidimension SDK
+# orjson when installed, stdlib json otherwise; both raise ValueError subclasses.
+# Request bodies are left to requests (json=...), like call dispatch.
+json_loads = orjson.loads if orjson else json.loads
+
+# The Omnidimension SDK (like requests) is imported on first use rather than at
+# module import, so workers that never place a call do not pay for loading it.
 OMNIDIMENSION_SDK_AVAILABLE = False
 OMNIDIMENSION_CLIENT = None
+_SDK_LOCK = threading.Lock()
+# SDK clients and their resolved dispatch methods per API key, kept here
+# since services are built for each call
+_SDK_CLIENTS = {}
+_SDK_DISPATCH = {}
+_USER_SITE_CHECKED = False
+# A failed SDK import is remembered for this many seconds before retrying,
+# so an install is still picked up without restarting the server
+_SDK_CHECK_TTL = 60.0
+_SDK_FAILED_AT = None
+
+# Separators users type into phone numbers, removed in one translate() pass
+_PHONE_STRIP_TABLE = str.maketrans('', '', ' \t-()')
+# E.164: '+', country code and subscriber number, at most 15 digits
+_E164_RE = re.compile(r'\+[1-9]\d{7,14}')
+# Indian mobile number without country code (10 digits starting with 6-9)
+_IN_MOBILE_RE = re.compile(r'[6-9]\d{9}')
+
+# Places the call id may appear in a dispatch response, in priority order
+_CALL_ID_PATHS = (
+    ('id',), ('call_id',), ('callId',),
+    ('data', 'id'), ('data', 'call_id'), ('data', 'callId'),
+    ('result', 'id'), ('result', 'call_id'),
+)
+
+# Places the collected call data may appear in a status response, in priority order
+_COLLECTED_DATA_PATHS = (
+    ('collected_data',), ('collected_info',),
+    ('data', 'collected_data'), ('data', 'collected_info'),
+)
+
+# call_params forwarded to the provider when they are set
+_CALL_METADATA_FIELDS = (
+    'candidate_name', 'agent_name', 'company_name', 'job_title',
+    'preferred_language', 'enable_language_detection',
+)
+_CALL_FLOW_FIELDS = ('conversation_flow', 'webhook_url')
+_SDK_CONTEXT_FIELDS = _CALL_METADATA_FIELDS + _CALL_FLOW_FIELDS
+
+def _pick_set_params(call_params, keys):
+    """Return the given keys of call_params that have a truthy value"""
+    picked = {}
+    for key in keys:
+        value = call_params.get(key)
+        if value:
+            picked[key] = value
+    return picked
+
+def _caller_id_name(call_params):
+    """Caller ID name shown to the candidate"""
+    # Set caller ID name to remove "spam" label - use agent name (e.g., "HR Assistant")
+    # or a generic name; avoid the company name to prevent spam labeling
+    return call_params.get('from_number_name') or call_params.get('agent_name') or 'Recruitment'
+
+def _dig(data, path):
+    """Follow a key path through nested dicts, returning None when a step is missing"""
+    for key in path:
+        if not isinstance(data, dict):
+            return None
+        data = data.get(key)
+    return data
 
 def _check_sdk_availability():
     """Check if SDK is available and import it"""
-    global OMNIDIMENSION_SDK_AVAILABLE, OMNIDIMENSION_CLIENT
+    global OMNIDIMENSION_SDK_AVAILABLE, OMNIDIMENSION_CLIENT, _USER_SITE_CHECKED, _SDK_FAILED_AT
     
     # If already loaded, return immediately
     if OMNIDIMENSION_SDK_AVAILABLE and OMNIDIMENSION_CLIENT is not None:
         return True
-    
-    try:
-        # Try importing from user site-packages first (common for --user installs)
-        import site
-        import sys
-        user_site = site.getusersitepackages()
-        if user_site and user_site not in sys.path:
-            sys.path.insert(0, user_site)
-            _logger.debug(f"Added user site-packages to path: {user_site}")
-        
-        # Try to import
-        from omnidimension import Client
-        OMNIDIMENSION_CLIENT = Client
-        OMNIDIMENSION_SDK_AVAILABLE = True
-        _logger.info("✅ Omnidimension Python SDK is available and loaded successfully")
-        return True
-    except ImportError as e:
-        OMNIDIMENSION_SDK_AVAILABLE = False
-        OMNIDIMENSION_CLIENT = None
-        _logger.warning(f"⚠️ Omnidimension Python SDK import failed: {e}")
-        _logger.warning(f"Install with: pip install --user omnidimension")
-        _logger.warning(f"Current Python path: {sys.path[:3]}...")
-        return False
-    except Exception as e:
-        OMNIDIMENSION_SDK_AVAILABLE = False
-        OMNIDIMENSION_CLIENT = None
-        _logger.error(f"Error checking SDK availability: {e}", exc_info=True)
+    if _SDK_FAILED_AT is not None and time.monotonic() - _SDK_FAILED_AT < _SDK_CHECK_TTL:
         return False
+    
+    with _SDK_LOCK:
+        # Another thread may have finished the check while we waited
+        if OMNIDIMENSION_SDK_AVAILABLE and OMNIDIMENSION_CLIENT is not None:
+            return True
+        if _SDK_FAILED_AT is not None and time.monotonic() - _SDK_FAILED_AT < _SDK_CHECK_TTL:
+            return False
+        
+        try:
+            import importlib.util
+            import sys
+            # find_spec() probes for the package without importing it
+            spec = importlib.util.find_spec('omnidimension')
+            if spec is None and not _USER_SITE_CHECKED:
+                # Retry with user site-packages (common for --user installs)
+                import site
+                user_site = site.getusersitepackages()
+                if user_site and user_site not in sys.path:
+                    sys.path.insert(0, user_site)
+                    _logger.debug(f"Added user site-packages to path: {user_site}")
+                _USER_SITE_CHECKED = True
+                spec = importlib.util.find_spec('omnidimension')
+            if spec is None:
+                OMNIDIMENSION_SDK_AVAILABLE = False
+                OMNIDIMENSION_CLIENT = None
+                _SDK_FAILED_AT = time.monotonic()
+                _logger.warning("⚠️ Omnidimension Python SDK is not installed")
+                _logger.warning("Install with: pip install --user omnidimension")
+                _logger.warning(f"Current Python path: {sys.path[:3]}...")
+                return False
+            
+            from omnidimension import Client
+            OMNIDIMENSION_CLIENT = Client
+            OMNIDIMENSION_SDK_AVAILABLE = True
+            _SDK_FAILED_AT = None
+            _logger.info("✅ Omnidimension Python SDK is available and loaded successfully")
+            return True
+        except ImportError as e:
+            OMNIDIMENSION_SDK_AVAILABLE = False
+            OMNIDIMENSION_CLIENT = None
+            _SDK_FAILED_AT = time.monotonic()
+            _logger.warning(f"⚠️ Omnidimension Python SDK import failed: {e}")
+            _logger.warning("Install with: pip install --user omnidimension")
+            _logger.warning(f"Current Python path: {sys.path[:3]}...")
+            return False
+        except Exception as e:
+            OMNIDIMENSION_SDK_AVAILABLE = False
+            OMNIDIMENSION_CLIENT = None
+            _SDK_FAILED_AT = time.monotonic()
+            _logger.error(f"Error checking SDK availability: {e}", exc_info=True)
+            return False
+
+# get_call_status() results per (api_endpoint, call_id), local to each worker.
+# A finished call is only kept long once its transcript and collected data are
+# in; before that the payload is still filling up and may be written back by
+# a sync, so it expires as quickly as a call in progress.
+_CALL_STATUS_TTL = 5.0
+_FINAL_CALL_STATUS_TTL = 3600.0
+_FINAL_CALL_STATUSES = frozenset({'completed', 'failed', 'no-answer', 'busy', 'canceled', 'cancelled'})
+_CALL_STATUS_CACHE_SIZE = 4096
+_call_status_cache = {}
+# get_call_analytics() results per (api_endpoint, call_id). Analytics only
+# exist once a call has finished, so successful results are kept long.
+_call_analytics_cache = {}
+_call_status_lock = threading.Lock()
+
+
+def _cache_get(cache, key):
+    """Return a copy of the unexpired value cached under key, or None"""
+    cached = cache.get(key)
+    if cached and cached[0] > time.monotonic():
+        return copy.deepcopy(cached[1])
+    return None
+
 
-# Try to load SDK at module import
-_check_sdk_availability()
+def _cache_put(cache, key, value, ttl):
+    """Cache a copy of value under key for ttl seconds, evicting when full"""
+    now = time.monotonic()
+    with _call_status_lock:
+        if len(cache) >= _CALL_STATUS_CACHE_SIZE:
+            for stale in [k for k, (expires, _v) in cache.items() if expires <= now]:
+                del cache[stale]
+            if len(cache) >= _CALL_STATUS_CACHE_SIZE:
+                # Still full: drop the oldest entry
+                del cache[next(iter(cache))]
+        cache[key] = (now + ttl, copy.deepcopy(value))
+
+
+# Pooled HTTP sessions per (api_endpoint, api_key). Services are built for
+# each call, so the sessions live here for their connections to be reused.
+_SESSIONS = {}
+_SESSIONS_LOCK = threading.Lock()
+
+
+# User-facing error messages; only the placeholders vary between calls
+_ERR_E164_TEMPLATE = (
+    'Phone number must be in E.164 format with country code. Got: {number}\n\n'
+    'Please format as: +[country code][number]\n'
+    'Example: +919016632843 (for India) or +1234567890 (for US)'
+)
+
+_ERR_ALL_ENDPOINTS_FAILED = (
+    '❌ All REST API endpoints failed. Connection timeout to www.omnidim.io\n\n'
+    '🔍 The issue: The REST API endpoint is not reachable or incorrect.\n\n'
+    '✅ SOLUTION: Install the OmniDimension Python SDK\n\n'
+    'To install the SDK, run this command in your Odoo server environment:\n'
+    '   pip install omnidimension\n\n'
+    'Or if using a virtual environment:\n'
+    '   source /path/to/venv/bin/activate\n'
+    '   pip install omnidimension\n\n'
+    'Then restart your Odoo server.\n\n'
+    'The SDK automatically uses the correct endpoint and is much more reliable.\n\n'
+    'Last error: {last_error}'
+)
+
+_ERR_HTML_404 = (
+    "❌ API endpoint not found - The URL is pointing to a website, not the API\n\n"
+    "The endpoint '{endpoint}' is returning an HTML page (likely an Odoo website), not an API endpoint.\n\n"
+    "🔍 Solutions:\n"
+    "1. Install the OmniDimension Python SDK (RECOMMENDED):\n"
+    "   pip install omnidimension\n\n"
+    "2. Or verify the correct API endpoint URL in your OmniDimension dashboard:\n"
+    "   - The endpoint should be an API URL, not a website URL\n"
+    "   - Common format: https://api.omnidim.io/api/v1\n"
+    "   - Check Settings → API in your dashboard\n\n"
+    "3. The REST API endpoint format may have changed\n\n"
+    "💡 The SDK automatically uses the correct endpoint and is the recommended method."
+)
+
+_ERR_NOT_FOUND_404 = (
+    "❌ API endpoint not found (404)\n\n"
+    "The endpoint '{endpoint}' does not exist.\n\n"
+    "🔍 Solutions:\n"
+    "1. Install the OmniDimension Python SDK (RECOMMENDED):\n"
+    "   pip install omnidimension\n\n"
+    "2. Verify the correct API endpoint URL in your OmniDimension dashboard\n\n"
+    "Response: {response}"
+)
+
+_ERR_DNS_FAILED = (
+    "❌ DNS Resolution Failed: Cannot resolve domain '{domain}'\n\n"
+    "This means the API endpoint domain does not exist or cannot be reached.\n\n"
+    "🔍 Troubleshooting Steps:\n"
+    "1. Verify the API endpoint URL in Telephony Configuration\n"
+    "   Current endpoint: {endpoint}\n"
+    "2. The correct OmniDimension AI endpoint should be from 'omnidim.io' domain\n"
+    "   Example: https://www.omnidim.io/api/v1 or https://api.omnidim.io/v1\n"
+    "3. Log into your OmniDimension AI dashboard and check Settings → API section\n"
+    "4. Verify your server has internet connectivity\n"
+    "5. Test DNS resolution: Run 'ping {domain}' or 'nslookup {domain}'\n"
+    "6. Contact OmniDimension AI support if the endpoint is still incorrect\n\n"
+    "💡 Note: This is NOT an API key issue. The domain itself cannot be found.\n"
+    "   The old domain 'api.omnidimension.ai' does not exist. Use 'omnidim.io' instead."
+)
 
 
 class OmniDimensionAIService:
     """Service for OmniDimension AI phone call integration"""
     
+    # REST dispatch URL that last answered for each configured endpoint. Kept
+    # on the class because a new service is built for every call.
+    _rest_urls = {}
+    
+    # Successful test_connection() results per (endpoint, API key) as (monotonic time, result)
+    _test_cache = {}
+    _TEST_CACHE_TTL = 30.0
+    
     def __init__(self, config: Dict):
         """
         Initialize OmniDimension AI Service
@@ -75,6 +285,39 @@ class OmniDimensionAIService:
         if self.api_endpoint.endswith('/'):
             self.api_endpoint = self.api_endpoint.rstrip('/')
         
+        # Candidate REST dispatch URLs - the API might use /calls/dispatch or /calls
+        # Remove /api/v1 from endpoint if present, we'll construct the path properly
+        base_endpoint = self.api_endpoint
+        if '/api/v1' in base_endpoint:
+            base_endpoint = base_endpoint.replace('/api/v1', '')
+        elif base_endpoint.endswith('/api'):
+            base_endpoint = base_endpoint[:-4]
+        # Try /api/v1/calls/dispatch first (per documentation)
+        self._api_urls = (
+            f'{base_endpoint}/api/v1/calls/dispatch',
+            f'{base_endpoint}/api/v1/calls',
+            f'{self.api_endpoint}/calls/dispatch',
+            f'{self.api_endpoint}/calls',
+        )
+        
+        # Agent creation URL: /api/v1/agents or /agents depending on endpoint format
+        if '/api/v1' in self.api_endpoint:
+            agents_path = '/agents'
+        elif self.api_endpoint.endswith('/api'):
+            agents_path = '/v1/agents'
+        else:
+            agents_path = '/api/v1/agents'
+        self._agents_url = f'{self.api_endpoint}{agents_path}'
+        
+        # Domain and site root of the endpoint (e.g., https://api.omnidim.io from
+        # https://api.omnidim.io/api/v1), used by the connection test and DNS errors
+        try:
+            parsed = urlparse(self.api_endpoint)
+            self._domain = parsed.netloc or parsed.path.split('/')[0]
+            self._base_url = f"{parsed.scheme}://{self._domain}"
+        except ValueError:
+            self._domain = self._base_url = self.api_endpoint
+        
         # Validate required fields
         if not self.api_key:
             _logger.warning("OmniDimension AI API key is not set")
@@ -87,6 +330,110 @@ class OmniDimensionAIService:
         if not self.api_endpoint.startswith(('http://', 'https://')):
             _logger.warning(f"API endpoint should start with http:// or https://. Got: {self.api_endpoint}")
     
+    @property
+    def api_key(self):
+        return self._api_key
+    
+    @api_key.setter
+    def api_key(self, value):
+        # Headers carry the key, so rebuild them when it changes
+        self._api_key = value
+        self._headers = {
+            'Authorization': f'Bearer {value}',
+            'Content-Type': 'application/json',
+        }
+    
+    def _get_sdk_client(self):
+        """Return the SDK client shared by services with this API key, building it on first use"""
+        client = _SDK_CLIENTS.get(self.api_key)
+        if client is None:
+            with _SDK_LOCK:
+                client = _SDK_CLIENTS.get(self.api_key)
+                if client is None:
+                    client = _SDK_CLIENTS[self.api_key] = OMNIDIMENSION_CLIENT(self.api_key)
+        return client
+    
+    @staticmethod
+    def _resolve_dispatch(client):
+        """
+        Find the SDK method used to place a call
+        
+        Returns:
+            Callable taking (agent_id, to_number, from_number_id, call_context)
+        """
+        call_api = getattr(client, 'call', None)
+        # dispatch_call is the documented SDK method
+        if hasattr(call_api, 'dispatch_call'):
+            def dispatch(agent_id, to_number, from_number_id, call_context):
+                return call_api.dispatch_call(
+                    agent_id=agent_id,
+                    to_number=to_number,
+                    from_number_id=from_number_id,
+                    call_context=call_context,
+                )
+            return dispatch
+        # Fallback to create if dispatch_call doesn't exist
+        if hasattr(call_api, 'create'):
+            _logger.info("Using client.call.create() method (fallback)")
+            def dispatch(agent_id, to_number, from_number_id, call_context):
+                return call_api.create(
+                    agent_id=agent_id,
+                    to=to_number,
+                    from_number_id=from_number_id,
+                    call_context=call_context,
+                )
+            return dispatch
+        
+        # Log available methods for debugging
+        available_attrs = [attr for attr in dir(client) if not attr.startswith('_')]
+        _logger.warning(f"SDK client available attributes: {available_attrs}")
+        if call_api is not None:
+            call_attrs = [attr for attr in dir(call_api) if not attr.startswith('_')]
+            _logger.warning(f"client.call available attributes: {call_attrs}")
+        raise AttributeError(
+            f"SDK does not have call dispatch method. "
+            f"Client has: {available_attrs}. "
+            f"client.call has: {call_attrs if call_api is not None else 'N/A'}. "
+            f"Please check Omnidimension SDK documentation for the correct method."
+        )
+    
+    def _get_session(self):
+        """Return the pooled HTTP session shared by services with this endpoint and key"""
+        key = (self.api_endpoint, self.api_key)
+        session = _SESSIONS.get(key)
+        if session is not None:
+            return session
+        with _SESSIONS_LOCK:
+            session = _SESSIONS.get(key)
+            if session is not None:
+                return session
+            import requests
+            from requests.adapters import HTTPAdapter
+            from urllib3.util.retry import Retry
+            
+            session = requests.Session()
+            # Only gateway statuses on idempotent requests (status polls) are
+            # retried. Connect and read errors are not, so a dead host still
+            # fails within one timeout, and POSTs are never re-sent.
+            adapter = HTTPAdapter(
+                pool_connections=10,
+                pool_maxsize=50,
+                max_retries=Retry(
+                    total=2,
+                    connect=0,
+                    read=0,
+                    backoff_factor=0.2,
+                    status_forcelist=(502, 503, 504),
+                    raise_on_status=False,
+                ),
+            )
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            session.headers.update(self._headers)
+            session.headers['User-Agent'] = 'Odoo-ResumeFollowUp/1.0'
+            _SESSIONS[key] = session
+        return session
+    
     def make_call(self, to_number: str, call_params: Dict) -> Dict:
         """
         Make a phone call using OmniDimension AI
@@ -106,21 +453,19 @@ class OmniDimensionAIService:
         """
         # Validate and format phone number (must be E.164 format: +countrycode+number)
         original_number = to_number
-        to_number = to_number.strip().replace(' ', '').replace('-', '').replace('(', '').replace(')', '')
+        to_number = to_number.translate(_PHONE_STRIP_TABLE).strip()
         
-        # If number doesn't start with +, try to add country code
-        if not to_number.startswith('+'):
+        # If number isn't in E.164 format, try to add country code
+        if not _E164_RE.fullmatch(to_number):
             # Common Indian number pattern (10 digits starting with 6-9)
-            if len(to_number) == 10 and to_number[0] in '6789':
+            if _IN_MOBILE_RE.fullmatch(to_number):
                 to_number = '+91' + to_number
-                _logger.info(f"Added country code +91 to phone number: {original_number} -> {to_number}")
+                _logger.debug("Added country code +91 to phone number: %s -> %s", original_number, to_number)
             else:
-                _logger.warning(f"Phone number {to_number} doesn't have country code (+). OmniDimension requires E.164 format (e.g., +919016632843)")
+                _logger.warning(f"Phone number {to_number} is not in E.164 format. OmniDimension requires E.164 format (e.g., +919016632843)")
                 return {
                     'status': 'error',
-                    'error': f'Phone number must be in E.164 format with country code. Got: {original_number}\n\n'
-                            f'Please format as: +[country code][number]\n'
-                            f'Example: +919016632843 (for India) or +1234567890 (for US)',
+                    'error': _ERR_E164_TEMPLATE.format(number=original_number),
                     'method': 'omnidimension_ai',
                 }
         
@@ -128,16 +473,13 @@ class OmniDimensionAIService:
         # Re-check SDK availability in case it was installed after module load
         sdk_available = _check_sdk_availability()
         
-        _logger.info(f"SDK availability check: {sdk_available}")
-        _logger.info(f"Making call to: {to_number} (original: {original_number})")
+        _logger.debug("Making call to %s (original: %s), SDK available: %s", to_number, original_number, sdk_available)
         
         if sdk_available:
-            _logger.info("🚀 Using OmniDimension SDK to make call (recommended method)")
             try:
                 result = self._make_call_with_sdk(to_number, call_params)
                 # If SDK succeeds, return it
                 if result.get('status') == 'initiated':
-                    _logger.info("✅ Call initiated successfully using SDK")
                     return result
                 # If SDK fails but returns an error, log it
                 error_msg = result.get('error', 'Unknown error')
@@ -145,7 +487,8 @@ class OmniDimensionAIService:
                 # Don't fallback to REST API if SDK is available - SDK errors are more informative
                 return result
             except Exception as e:
-                _logger.error(f"❌ SDK call raised exception: {e}", exc_info=True)
+                _logger.error(f"❌ SDK call raised exception: {e}")
+                _logger.debug("SDK call traceback", exc_info=True)
                 # Return error instead of falling back to REST API
                 return {
                     'status': 'error',
@@ -161,178 +504,100 @@ class OmniDimensionAIService:
     
     def _make_call_with_sdk(self, to_number: str, call_params: Dict) -> Dict:
         """Make call using Omnidimension Python SDK"""
-        try:
-            if not self.api_key:
-                return {
-                    'status': 'error',
-                    'error': 'API key is required to make a call',
-                    'method': 'omnidimension_ai',
-                }
-            
-            if not self.agent_id:
-                return {
-                    'status': 'error',
-                    'error': 'Agent ID is required to make a call. Please create an agent first.',
-                    'method': 'omnidimension_ai',
-                }
-            
-            # Ensure SDK is available and import Client
-            if not _check_sdk_availability():
-                return {
-                    'status': 'error',
-                    'error': 'OmniDimension SDK is not available. Please install it: pip install --user omnidimension',
-                    'method': 'omnidimension_ai',
-                }
-            
-            from omnidimension import Client
-            client = Client(self.api_key)
-            
-            # Convert agent_id to int if it's a numeric string (SDK might expect int)
-            agent_id = self.agent_id
-            try:
-                if isinstance(agent_id, str) and agent_id.isdigit():
-                    agent_id = int(agent_id)
-            except (ValueError, AttributeError):
-                pass  # Keep as string if conversion fails
-            
-            # Prepare call parameters for dispatch_call
-            # The SDK dispatch_call signature is: dispatch_call(agent_id, to_number, from_number_id=None, call_context=None)
-            
-            # Build call_context from metadata and other params
-            call_context = {}
-            
-            # Add metadata if provided
-            if call_params.get('candidate_name'):
-                call_context['candidate_name'] = call_params.get('candidate_name')
-            if call_params.get('agent_name'):
-                call_context['agent_name'] = call_params.get('agent_name')
-            if call_params.get('company_name'):
-                call_context['company_name'] = call_params.get('company_name')
-            if call_params.get('job_title'):
-                call_context['job_title'] = call_params.get('job_title')
-            if call_params.get('conversation_flow'):
-                call_context['conversation_flow'] = call_params.get('conversation_flow')
-            if call_params.get('webhook_url'):
-                call_context['webhook_url'] = call_params.get('webhook_url')
-            if call_params.get('record') is not None:
-                call_context['record'] = call_params.get('record')
-            
-            # Add language preferences for AI
-            if call_params.get('preferred_language'):
-                call_context['preferred_language'] = call_params.get('preferred_language')
-            if call_params.get('enable_language_detection'):
-                call_context['enable_language_detection'] = call_params.get('enable_language_detection')
-            
-            # Set caller ID name to remove "spam" label - use agent name (preferred) or generic name
-            # Avoid using company name to prevent spam labeling
-            if call_params.get('from_number_name'):
-                call_context['from_number_name'] = call_params.get('from_number_name')
-            elif call_params.get('agent_name'):
-                # Use agent name (e.g., "HR Assistant") instead of company name
-                call_context['from_number_name'] = call_params.get('agent_name')
-            else:
-                # Use generic professional name
-                call_context['from_number_name'] = 'Recruitment'
-            
-            # from_number_id is optional - can be None
-            from_number_id = call_params.get('from_number_id', None)
-            
-            # Reduced logging for faster call initiation
-            _logger.info(f"Making call to {to_number} with agent_id {agent_id}")
-            
-            # Make the call using SDK - use dispatch_call method
-            response = None
-            
-            # Try dispatch_call method (the correct SDK method)
-            if hasattr(client, 'call') and hasattr(client.call, 'dispatch_call'):
-                # Minimal logging for speed
-                response = client.call.dispatch_call(
-                    agent_id=agent_id,
-                    to_number=to_number,
-                    from_number_id=from_number_id,
-                    call_context=call_context if call_context else None
-                )
-                _logger.info(f"Call initiated: {type(response)}")
-            elif hasattr(client, 'call') and hasattr(client.call, 'create'):
-                # Fallback to create if dispatch_call doesn't exist
-                _logger.info("Using client.call.create() method (fallback)")
-                call_data = {
-                    'agent_id': agent_id,
-                    'to': to_number,
-                    'from_number_id': from_number_id,
-                    'call_context': call_context if call_context else None
-                }
-                response = client.call.create(**call_data)
-            else:
-                # Log available methods for debugging
-                available_attrs = [attr for attr in dir(client) if not attr.startswith('_')]
-                _logger.warning(f"SDK client available attributes: {available_attrs}")
-                if hasattr(client, 'call'):
-                    call_attrs = [attr for attr in dir(client.call) if not attr.startswith('_')]
-                    _logger.warning(f"client.call available attributes: {call_attrs}")
-                raise AttributeError(
-                    f"SDK does not have call dispatch method. "
-                    f"Client has: {available_attrs}. "
-                    f"client.call has: {call_attrs if hasattr(client, 'call') else 'N/A'}. "
-                    f"Please check Omnidimension SDK documentation for the correct method."
-                )
-            
-            # Extract call ID from response - try multiple possible formats
-            call_id = None
-            if isinstance(response, dict):
-                # Try various possible keys
-                call_id = (response.get('id') or 
-                          response.get('call_id') or 
-                          response.get('callId') or
-                          response.get('data', {}).get('id') or
-                          response.get('data', {}).get('call_id') or
-                          response.get('data', {}).get('callId') or
-                          response.get('result', {}).get('id') or
-                          response.get('result', {}).get('call_id'))
-                _logger.info(f"Response dict keys: {list(response.keys())}")
-            elif hasattr(response, 'id'):
-                call_id = response.id
-            elif hasattr(response, 'call_id'):
-                call_id = response.call_id
-            elif hasattr(response, 'callId'):
-                call_id = response.callId
-            elif hasattr(response, '__dict__'):
-                # Try to get from object attributes
-                call_id = getattr(response, 'id', None) or getattr(response, 'call_id', None) or getattr(response, 'callId', None)
-                _logger.info(f"Response object attributes: {dir(response)}")
-            
-            if not call_id:
-                _logger.warning(f"Could not extract call_id from response. Full response: {response}")
-                # If response is truthy but no call_id, the call might still have been initiated
-                # Return success but log the full response for debugging
-                if response:
-                    _logger.info("Response received but call_id not found. Call may still be processing.")
-            
-            _logger.info(f"Call initiated successfully. Call ID: {call_id}")
-            
-            # Even if call_id is empty, if we got a response, the call might have been initiated
-            # Return success but include warning if no call_id
-            result = {
-                'status': 'initiated',
-                'call_id': str(call_id) if call_id else '',
-                'call_sid': str(call_id) if call_id else '',  # Use call_id as call_sid for compatibility
+        if not self.api_key:
+            return {
+                'status': 'error',
+                'error': 'API key is required to make a call',
                 'method': 'omnidimension_ai',
-                'to_number': to_number,
             }
-            
-            if not call_id:
-                _logger.warning("⚠️ Call initiated but no call_id returned. Check OmniDimension dashboard for call status.")
-                result['warning'] = 'Call may have been initiated but no call_id was returned. Please check your OmniDimension dashboard.'
-            
-            return result
-            
-        except Exception as e:
-            _logger.error(f"Error making call with SDK: {e}", exc_info=True)
-            # Re-raise to let the caller handle fallback
-            raise
+        
+        if not self.agent_id:
+            return {
+                'status': 'error',
+                'error': 'Agent ID is required to make a call. Please create an agent first.',
+                'method': 'omnidimension_ai',
+            }
+        
+        # make_call only gets here once _check_sdk_availability() succeeded
+        client = self._get_sdk_client()
+        
+        # Convert agent_id to int if it's a numeric string (SDK might expect int)
+        agent_id = self.agent_id
+        try:
+            if isinstance(agent_id, str) and agent_id.isdigit():
+                agent_id = int(agent_id)
+        except (ValueError, AttributeError):
+            pass  # Keep as string if conversion fails
+        
+        # Prepare call parameters for dispatch_call
+        # The SDK dispatch_call signature is: dispatch_call(agent_id, to_number, from_number_id=None, call_context=None)
+        
+        # Build call_context from metadata and other params
+        call_context = _pick_set_params(call_params, _SDK_CONTEXT_FIELDS)
+        record = call_params.get('record')
+        if record is not None:
+            call_context['record'] = record
+        call_context['from_number_name'] = _caller_id_name(call_params)
+        
+        # from_number_id is optional - can be None
+        from_number_id = call_params.get('from_number_id', None)
+        
+        # Make the call using SDK, resolving the dispatch method only once
+        dispatch = _SDK_DISPATCH.get(self.api_key)
+        if dispatch is None:
+            dispatch = _SDK_DISPATCH[self.api_key] = self._resolve_dispatch(client)
+        response = dispatch(
+            agent_id, to_number, from_number_id, call_context if call_context else None
+        )
+        
+        # Extract call ID from response - try multiple possible formats
+        call_id = None
+        if isinstance(response, dict):
+            # Try various possible keys
+            call_id = next(filter(None, (_dig(response, path) for path in _CALL_ID_PATHS)), None)
+            _logger.debug("Response dict keys: %s", list(response.keys()))
+        elif hasattr(response, 'id'):
+            call_id = response.id
+        elif hasattr(response, 'call_id'):
+            call_id = response.call_id
+        elif hasattr(response, 'callId'):
+            call_id = response.callId
+        elif hasattr(response, '__dict__'):
+            # Try to get from object attributes
+            call_id = getattr(response, 'id', None) or getattr(response, 'call_id', None) or getattr(response, 'callId', None)
+            if _logger.isEnabledFor(logging.DEBUG):
+                _logger.debug("Response object attributes: %s", dir(response))
+        
+        if not call_id:
+            _logger.warning(f"Could not extract call_id from response. Full response: {response}")
+            # If response is truthy but no call_id, the call might still have been initiated
+            # Return success but log the full response for debugging
+            if response:
+                _logger.debug("Response received but call_id not found. Call may still be processing.")
+        
+        _logger.info(f"Call dispatched via SDK: id={call_id} to={to_number}")
+        
+        # Even if call_id is empty, if we got a response, the call might have been initiated
+        # Return success but include warning if no call_id
+        call_id = str(call_id) if call_id else ''
+        result = {
+            'status': 'initiated',
+            'call_id': call_id,
+            'call_sid': call_id,  # Use call_id as call_sid for compatibility
+            'method': 'omnidimension_ai',
+            'to_number': to_number,
+        }
+        
+        if not call_id:
+            _logger.warning("⚠️ Call initiated but no call_id returned. Check OmniDimension dashboard for call status.")
+            result['warning'] = 'Call may have been initiated but no call_id was returned. Please check your OmniDimension dashboard.'
+        
+        return result
     
     def _make_call_with_rest_api(self, to_number: str, call_params: Dict) -> Dict:
         """Make call using REST API (fallback method)"""
+        import requests
+        
         try:
             if not self.api_key:
                 return {
@@ -358,79 +623,40 @@ class OmniDimensionAIService:
             if self.voice_id:
                 payload['voice_id'] = self.voice_id
             
-            if call_params.get('conversation_flow'):
-                payload['conversation_flow'] = call_params.get('conversation_flow')
-            
-            if call_params.get('webhook_url'):
-                payload['webhook_url'] = call_params.get('webhook_url')
+            payload.update(_pick_set_params(call_params, _CALL_FLOW_FIELDS))
             
-            if call_params.get('record') is not None:
-                payload['record'] = call_params.get('record', True)
+            record = call_params.get('record')
+            if record is not None:
+                payload['record'] = record
             
-            # Set caller ID name to remove "spam" label - use agent name (preferred) or generic name
-            # Avoid using company name to prevent spam labeling
-            if call_params.get('from_number_name'):
-                payload['from_number_name'] = call_params.get('from_number_name')
-            elif call_params.get('agent_name'):
-                # Use agent name (e.g., "HR Assistant") instead of company name
-                payload['from_number_name'] = call_params.get('agent_name')
-            else:
-                # Use generic professional name
-                payload['from_number_name'] = 'Recruitment'
+            payload['from_number_name'] = _caller_id_name(call_params)
             
             # Add metadata
-            metadata = {}
-            if call_params.get('candidate_name'):
-                metadata['candidate_name'] = call_params.get('candidate_name')
-            if call_params.get('agent_name'):
-                metadata['agent_name'] = call_params.get('agent_name')
-            if call_params.get('company_name'):
-                metadata['company_name'] = call_params.get('company_name')
-            if call_params.get('job_title'):
-                metadata['job_title'] = call_params.get('job_title')
-            
-            # Add language preferences for AI
-            if call_params.get('preferred_language'):
-                metadata['preferred_language'] = call_params.get('preferred_language')
-            if call_params.get('enable_language_detection'):
-                metadata['enable_language_detection'] = call_params.get('enable_language_detection')
-            
+            metadata = _pick_set_params(call_params, _CALL_METADATA_FIELDS)
             if metadata:
                 payload['metadata'] = metadata
 
-            # Make API request
-            headers = {
-                'Authorization': f'Bearer {self.api_key}',
-                'Content-Type': 'application/json',
-            }
+            session = self._get_session()
 
-            # Try different endpoint paths - the API might use /calls/dispatch or /calls
-            # Remove /api/v1 from endpoint if present, we'll construct the path properly
-            base_endpoint = self.api_endpoint
-            if '/api/v1' in base_endpoint:
-                base_endpoint = base_endpoint.replace('/api/v1', '')
-            elif base_endpoint.endswith('/api'):
-                base_endpoint = base_endpoint[:-4]
-            
-            # Try /api/v1/calls/dispatch first (per documentation)
-            api_urls = [
-                f'{base_endpoint}/api/v1/calls/dispatch',
-                f'{base_endpoint}/api/v1/calls',
-                f'{self.api_endpoint}/calls/dispatch',
-                f'{self.api_endpoint}/calls',
-            ]
+            api_urls = self._api_urls
+            
+            # Start with the URL that answered last time so the probe is skipped
+            cached_url = self._rest_urls.get(self.api_endpoint)
+            if cached_url in api_urls:
+                probe_urls = (cached_url,) + tuple(url for url in api_urls if url != cached_url)
+            else:
+                probe_urls = api_urls
             
             last_error = None
             response = None
             successful_url = None
             
-            for api_url in api_urls:
+            for api_url in probe_urls:
                 try:
-                    _logger.info(f"Trying API endpoint: {api_url}")
-                    response = requests.post(
+                    _logger.debug("Trying API endpoint: %s", api_url)
+                    response = session.post(
                         api_url,
                         json=payload,
-                        headers=headers,
                         timeout=self.timeout
                     )
                     
@@ -458,28 +684,18 @@ class OmniDimensionAIService:
                     continue
             
             if response is None:
+                self._rest_urls.pop(self.api_endpoint, None)
                 # All endpoints failed - provide clear solution
-                error_msg = (
-                    f'❌ All REST API endpoints failed. Connection timeout to www.omnidim.io\n\n'
-                    f'🔍 The issue: The REST API endpoint is not reachable or incorrect.\n\n'
-                    f'✅ SOLUTION: Install the OmniDimension Python SDK\n\n'
-                    f'To install the SDK, run this command in your Odoo server environment:\n'
-                    f'   pip install omnidimension\n\n'
-                    f'Or if using a virtual environment:\n'
-                    f'   source /path/to/venv/bin/activate\n'
-                    f'   pip install omnidimension\n\n'
-                    f'Then restart your Odoo server.\n\n'
-                    f'The SDK automatically uses the correct endpoint and is much more reliable.\n\n'
-                    f'Last error: {last_error}'
-                )
                 return {
                     'status': 'error',
-                    'error': error_msg,
+                    'error': _ERR_ALL_ENDPOINTS_FAILED.format(last_error=last_error),
                     'method': 'omnidimension_ai',
                 }
 
+            self._rest_urls[self.api_endpoint] = successful_url
+            
             if response.status_code == 200 or response.status_code == 201:
-                result = response.json()
+                result = json_loads(response.content)
                 _logger.info(f"Call initiated successfully via REST API using endpoint: {successful_url}")
                 return {
                     'status': 'initiated',
@@ -491,12 +707,15 @@ class OmniDimensionAIService:
                     'to_number': to_number,
                 }
             else:
-                error_text = response.text
-                try:
-                    error_json = response.json()
-                    error_text = error_json.get('message', error_json.get('error', error_text))
-                except:
-                    pass
+                # Only parse JSON bodies; cap anything else (e.g. HTML error pages)
+                if 'application/json' in response.headers.get('Content-Type', ''):
+                    try:
+                        error_json = json_loads(response.content)
+                        error_text = error_json.get('message', error_json.get('error', response.text))
+                    except (ValueError, AttributeError):
+                        error_text = response.text
+                else:
+                    error_text = response.text[:500]
                 
                 _logger.error(f"OmniDimension AI API error: {response.status_code} - {error_text}")
                 _logger.error(f"Request URL: {successful_url or api_urls[0]}")
@@ -505,29 +724,9 @@ class OmniDimensionAIService:
                 if response.status_code == 404 or 'text/html' in response.headers.get('Content-Type', ''):
                     # Check if response is HTML (Odoo 404 page)
                     if '<html' in error_text or '<!DOCTYPE html>' in error_text:
-                        error_msg = (
-                            f"❌ API endpoint not found - The URL is pointing to a website, not the API\n\n"
-                            f"The endpoint '{api_url}' is returning an HTML page (likely an Odoo website), not an API endpoint.\n\n"
-                            f"🔍 Solutions:\n"
-                            f"1. Install the OmniDimension Python SDK (RECOMMENDED):\n"
-                            f"   pip install omnidimension\n\n"
-                            f"2. Or verify the correct API endpoint URL in your OmniDimension dashboard:\n"
-                            f"   - The endpoint should be an API URL, not a website URL\n"
-                            f"   - Common format: https://api.omnidim.io/api/v1\n"
-                            f"   - Check Settings → API in your dashboard\n\n"
-                            f"3. The REST API endpoint format may have changed\n\n"
-                            f"💡 The SDK automatically uses the correct endpoint and is the recommended method."
-                        )
+                        error_msg = _ERR_HTML_404.format(endpoint=api_url)
                     else:
-                        error_msg = (
-                            f"❌ API endpoint not found (404)\n\n"
-                            f"The endpoint '{api_url}' does not exist.\n\n"
-                            f"🔍 Solutions:\n"
-                            f"1. Install the OmniDimension Python SDK (RECOMMENDED):\n"
-                            f"   pip install omnidimension\n\n"
-                            f"2. Verify the correct API endpoint URL in your OmniDimension dashboard\n\n"
-                            f"Response: {error_text[:200]}"
-                        )
+                        error_msg = _ERR_NOT_FOUND_404.format(endpoint=api_url, response=error_text[:200])
                 else:
                     error_msg = f"API error: {response.status_code} - {error_text}"
                 
@@ -541,29 +740,7 @@ class OmniDimensionAIService:
             # Handle DNS resolution and connection errors
             error_msg = str(e)
             if 'Failed to resolve' in error_msg or 'Name or service not known' in error_msg or 'NXDOMAIN' in error_msg:
-                # Extract domain from endpoint
-                try:
-                    from urllib.parse import urlparse
-                    parsed = urlparse(self.api_endpoint)
-                    domain = parsed.netloc or parsed.path.split('/')[0]
-                except:
-                    domain = self.api_endpoint
-                
-                user_friendly_error = (
-                    f"❌ DNS Resolution Failed: Cannot resolve domain '{domain}'\n\n"
-                    f"This means the API endpoint domain does not exist or cannot be reached.\n\n"
-                    f"🔍 Troubleshooting Steps:\n"
-                    f"1. Verify the API endpoint URL in Telephony Configuration\n"
-                    f"   Current endpoint: {self.api_endpoint}\n"
-                    f"2. The correct OmniDimension AI endpoint should be from 'omnidim.io' domain\n"
-                    f"   Example: https://www.omnidim.io/api/v1 or https://api.omnidim.io/v1\n"
-                    f"3. Log into your OmniDimension AI dashboard and check Settings → API section\n"
-                    f"4. Verify your server has internet connectivity\n"
-                    f"5. Test DNS resolution: Run 'ping {domain}' or 'nslookup {domain}'\n"
-                    f"6. Contact OmniDimension AI support if the endpoint is still incorrect\n\n"
-                    f"💡 Note: This is NOT an API key issue. The domain itself cannot be found.\n"
-                    f"   The old domain 'api.omnidimension.ai' does not exist. Use 'omnidim.io' instead."
-                )
+                user_friendly_error = _ERR_DNS_FAILED.format(domain=self._domain, endpoint=self.api_endpoint)
             else:
                 user_friendly_error = (
                     f"Connection error: {error_msg}\n"
@@ -590,42 +767,68 @@ class OmniDimensionAIService:
                 'method': 'omnidimension_ai',
             }
         except Exception as e:
-            _logger.error(f"OmniDimension AI error: {e}", exc_info=True)
+            _logger.error(f"OmniDimension AI error: {e}")
+            _logger.debug("OmniDimension AI traceback", exc_info=True)
             return {
                 'status': 'error',
                 'error': f"Unexpected error: {str(e)}",
                 'method': 'omnidimension_ai',
             }
 
-    def get_call_status(self, call_id: str) -> Dict:
+    def get_call_status(self, call_id: str, use_cache: bool = True) -> Dict:
         """
         Get status of an ongoing call
         
+        Results are cached for a few seconds (an hour once the call has
+        finished and its transcript and collected data are in); errors are
+        never cached.
+        
         Args:
             call_id: Call ID from make_call response
+            use_cache: False to always ask the API; the fresh result is still cached
             
         Returns:
             Dictionary with call status
         """
+        key = (self.api_endpoint, str(call_id))
+        if use_cache:
+            cached = _cache_get(_call_status_cache, key)
+            if cached is not None:
+                return cached
+        
+        result = self._fetch_call_status(call_id)
+        if result.get('status') != 'error':
+            if (result['status'] in _FINAL_CALL_STATUSES
+                    and result.get('transcript') and result.get('collected_data')):
+                ttl = _FINAL_CALL_STATUS_TTL
+            else:
+                ttl = _CALL_STATUS_TTL
+            _cache_put(_call_status_cache, key, result, ttl)
+        return result
+    
+    @staticmethod
+    def invalidate_call_status(call_id) -> None:
+        """Drop cached status and analytics results for a call, e.g. when a webhook reports a change"""
+        call_id = str(call_id)
+        with _call_status_lock:
+            for cache in (_call_status_cache, _call_analytics_cache):
+                for key in [k for k in cache if k[1] == call_id]:
+                    del cache[key]
+    
+    def _fetch_call_status(self, call_id: str) -> Dict:
+        """Request the status of a call from the API, bypassing the cache"""
         try:
-            headers = {
-                'Authorization': f'Bearer {self.api_key}',
-                'Content-Type': 'application/json',
-            }
-            
-            response = requests.get(
+            response = self._get_session().get(
                 f'{self.api_endpoint}/calls/{call_id}',
-                headers=headers,
                 timeout=self.timeout
             )
             
             if response.status_code == 200:
-                result = response.json()
+                result = json_loads(response.content)
                 # Try multiple possible keys for collected data
-                collected_data = (result.get('collected_data') or 
-                                result.get('collected_info') or 
-                                result.get('data', {}).get('collected_data') or
-                                result.get('data', {}).get('collected_info') or {})
+                collected_data = next(
+                    filter(None, (_dig(result, path) for path in _COLLECTED_DATA_PATHS)), {}
+                )
                 
                 return {
                     'status': result.get('status', 'unknown'),
@@ -645,30 +848,52 @@ class OmniDimensionAIService:
             _logger.error(f"Error getting call status: {e}", exc_info=True)
             return {'status': 'error', 'error': str(e)}
     
+    def get_call_statuses(self, call_ids: List[str], max_workers: int = 16) -> Dict[str, Dict]:
+        """
+        Get the status of several calls concurrently
+        
+        Args:
+            call_ids: Call IDs from make_call responses
+            max_workers: Maximum number of requests in flight
+            
+        Returns:
+            Dictionary mapping each call ID to its get_call_status() result
+        """
+        call_ids = list(dict.fromkeys(call_ids))
+        if not call_ids:
+            return {}
+        # Build the pooled session up front so the workers share one
+        self._get_session()
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(call_ids))) as executor:
+            return dict(zip(call_ids, executor.map(self.get_call_status, call_ids)))
+    
     def get_call_analytics(self, call_id: str) -> Dict:
         """
         Get analytics for a completed call
         
+        Successful results are cached for an hour; errors are never cached.
+        
         Args:
             call_id: Call ID from make_call response
             
         Returns:
             Dictionary with call analytics
         """
+        key = (self.api_endpoint, str(call_id))
+        cached = _cache_get(_call_analytics_cache, key)
+        if cached is not None:
+            return cached
+        
         try:
-            headers = {
-                'Authorization': f'Bearer {self.api_key}',
-                'Content-Type': 'application/json',
-            }
-            
-            response = requests.get(
+            response = self._get_session().get(
                 f'{self.api_endpoint}/calls/{call_id}/analytics',
-                headers=headers,
                 timeout=self.timeout
             )
             
             if response.status_code == 200:
-                return response.json()
+                result = json_loads(response.content)
+                _cache_put(_call_analytics_cache, key, result, _FINAL_CALL_STATUS_TTL)
+                return result
             else:
                 return {'error': f"API error: {response.status_code}"}
                 
@@ -680,16 +905,31 @@ class OmniDimensionAIService:
         """
         Test connection to the API endpoint
         
+        A successful result is reused for 30 seconds so repeated clicks on the
+        test button don't re-resolve DNS and re-probe the server. Failures are
+        never reused, so a fixed network or endpoint is picked up on the next try.
+        
         Returns:
             Dictionary with test results
         """
+        key = (self.api_endpoint, self.api_key)
+        cached = self._test_cache.get(key)
+        if cached and time.monotonic() - cached[0] < self._TEST_CACHE_TTL:
+            return dict(cached[1])
+        result = self._run_connection_test()
+        if result and result.get('status') == 'success':
+            self._test_cache[key] = (time.monotonic(), result)
+            result = dict(result)
+        return result
+    
+    def _run_connection_test(self) -> Dict:
+        """Resolve the endpoint's domain and probe it over HTTP"""
+        import requests
+        
         try:
-            from urllib.parse import urlparse
-            parsed = urlparse(self.api_endpoint)
-            domain = parsed.netloc or parsed.path.split('/')[0]
+            domain = self._domain
             
             # Try to resolve DNS first
-            import socket
             try:
                 socket.gethostbyname(domain)
                 dns_status = "✅ DNS resolution successful"
@@ -703,15 +943,16 @@ class OmniDimensionAIService:
                 }
             
             # Try to connect to the base domain first (more reliable than /api/v1 endpoint)
-            # Extract base URL (e.g., https://api.omnidim.io from https://api.omnidim.io/api/v1)
-            base_url = f"{parsed.scheme}://{domain}"
+            base_url = self._base_url
+            session = self._get_session()
             
             # Try connecting to base URL first
             try:
-                response = requests.get(
+                response = session.get(
                     base_url,
                     timeout=10,
-                    headers={'User-Agent': 'Odoo-ResumeFollowUp/1.0'},
+                    # The base site is not the API, don't send it the key
+                    headers={'Authorization': None},
                     allow_redirects=True
                 )
                 return {
@@ -725,13 +966,9 @@ class OmniDimensionAIService:
             except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
                 # If base URL fails, try the actual endpoint (might require auth, so expect 401/403)
                 try:
-                    response = requests.get(
+                    response = session.get(
                         self.api_endpoint,
                         timeout=10,
-                        headers={
-                            'User-Agent': 'Odoo-ResumeFollowUp/1.0',
-                            'Authorization': f'Bearer {self.api_key}' if self.api_key else ''
-                        },
                         allow_redirects=True
                     )
                     # Even if we get 401/403, it means the endpoint exists and is reachable
@@ -802,7 +1039,7 @@ class OmniDimensionAIService:
             Dictionary with agent creation result
         """
         # Try using SDK first if available
-        if OMNIDIMENSION_SDK_AVAILABLE:
+        if _check_sdk_availability():
             return self._create_agent_with_sdk(name, welcome_message, context_breakdown, 
                                                call_type, transcriber, model, voice)
         else:
@@ -822,16 +1059,8 @@ class OmniDimensionAIService:
             }
         
         try:
-            # Ensure SDK is available
-            if not _check_sdk_availability():
-                return {
-                    'status': 'error',
-                    'error': 'OmniDimension SDK is not available. Please install it: pip install --user omnidimension',
-                }
-            
-            # Import Client dynamically
-            from omnidimension import Client
-            client = Client(self.api_key)
+            # create_agent only gets here once _check_sdk_availability() succeeded
+            client = self._get_sdk_client()
             
             # Prepare transcriber config
             transcriber_config = transcriber or {
@@ -892,6 +1121,8 @@ class OmniDimensionAIService:
                                    call_type: str = 'Outgoing', transcriber: Dict = None, 
                                    model: Dict = None, voice: Dict = None) -> Dict:
         """Create agent using REST API (fallback when SDK is not available)"""
+        import requests
+        
         if not self.api_key:
             return {
                 'status': 'error',
@@ -928,33 +1159,18 @@ class OmniDimensionAIService:
                 'voice': voice_config,
             }
             
-            # Determine API endpoint path
-            # Try /api/v1/agents or /agents depending on endpoint format
-            if '/api/v1' in self.api_endpoint:
-                api_path = '/agents'
-            elif self.api_endpoint.endswith('/api'):
-                api_path = '/v1/agents'
-            else:
-                api_path = '/api/v1/agents'
-            
-            api_url = f'{self.api_endpoint}{api_path}'
+            api_url = self._agents_url
             _logger.info(f"Creating agent via REST API: {api_url}")
             
             # Make API request
-            headers = {
-                'Authorization': f'Bearer {self.api_key}',
-                'Content-Type': 'application/json',
-            }
-            
-            response = requests.post(
+            response = self._get_session().post(
                 api_url,
                 json=payload,
-                headers=headers,
                 timeout=self.timeout
             )
             
             if response.status_code in [200, 201]:
-                result = response.json()
+                result = json_loads(response.content)
                 # Extract agent ID from response
                 agent_id = result.get('id') or result.get('agent_id') or result.get('data', {}).get('id')
                 
@@ -968,10 +1184,15 @@ class OmniDimensionAIService:
                 }
             else:
                 error_msg = f"API error: {response.status_code}"
-                try:
-                    error_data = response.json()
+                error_data = None
+                if 'application/json' in response.headers.get('Content-Type', ''):
+                    try:
+                        error_data = json_loads(response.content)
+                    except ValueError:
+                        pass
+                if isinstance(error_data, dict):
                     error_msg = error_data.get('error', error_data.get('message', error_msg))
-                except:
+                else:
                     error_msg = f"{error_msg} - {response.text[:200]}"
                 
                 _logger.error(f"Failed to create agent via REST API: {error_msg}")
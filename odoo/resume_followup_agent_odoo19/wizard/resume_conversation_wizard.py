@@ -1008,7 +1008,7 @@ class ResumeConversationWizard(models.TransientModel):
             'job_title': self.job_title,
             'transcript': transcript,
             'duration': self.duration,
-            'collected_info': json.dumps(collected_info),
+            'collected_info': collected_info,
             'brief_introduction': self.introduction or '',
             'introduction': self.introduction or '',
             'current_position': self.current_position or '',
@@ -1078,14 +1078,15 @@ class ResumeConversationWizard(models.TransientModel):
             if domain:
                 existing_conversation = self.env['resume.conversation'].search(domain, limit=1)
         
+        # The call data is synced explicitly below, so skip the automatic sync on save
         if existing_conversation:
             # Update existing conversation with all collected data
-            existing_conversation.write(conversation_vals)
+            existing_conversation.with_context(no_auto_sync=True).write(conversation_vals)
             conversation = existing_conversation
             _logger.info(f"✅ Updated existing conversation {conversation.id} with call data")
         else:
             # Create new conversation
-            conversation = self.env['resume.conversation'].create(conversation_vals)
+            conversation = self.env['resume.conversation'].with_context(no_auto_sync=True).create(conversation_vals)
             _logger.info(f"✅ Created new conversation {conversation.id}")
         
         # Auto-sync call data from OmniDimension if call_id exists (force sync)